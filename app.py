@@ -6,13 +6,16 @@ import google.generativeai as genai
 
 # Import modules
 from config.settings import load_configuration
-from utils.session import initialize_session_state
+from utils.session import initialize_session_state, sync_evaluation_results
 from utils.helpers import is_alarm_related_question
-from models.rag import setup_rag_components, create_rag_chain
+from models.rag import setup_rag_components, create_rag_chain, scope_retriever
+from models.answer_cache import get_answer_cache, create_canonical_rag_chain
 from evaluation.evaluator import GeminiRagasEvaluator
+from evaluation.jobs import get_evaluation_queue
 from ui.sidebar import render_sidebar
 from ui.chat import display_chat, handle_user_input
-from ui.evaluation import render_evaluation_dashboard, display_evaluation_results
+from ui.evaluation import render_evaluation_dashboard
+from ui.triage import render_triage_page
 from data.language import SUPPORTED_LANGUAGES
 
 def main():
@@ -26,9 +29,13 @@ def main():
     # Load configuration
     config = load_configuration()
     
+    # Background evaluation queue shared by all sessions in this process
+    eval_queue = get_evaluation_queue()
+    
     # Check for viewing evaluation dashboard
     if "view_evaluation" in st.session_state and st.session_state.view_evaluation:
-        render_evaluation_dashboard()
+        sync_evaluation_results(eval_queue.get_jobs(st.session_state.evaluation_jobs))
+        render_evaluation_dashboard(eval_queue)
         if st.button("Back to Chat"):
             st.session_state.view_evaluation = False
             st.rerun()
@@ -53,32 +60,43 @@ def main():
         # Set up LLM
         llm = config['model_setup'](google_api_key)
         
-        # Initialize evaluator
+        # Initialize evaluator and pick up this session's jobs that are not running anywhere
         evaluator = GeminiRagasEvaluator(google_api_key)
+        eval_queue.resume_pending(evaluator, st.session_state.evaluation_jobs)
+        sync_evaluation_results(eval_queue.get_jobs(st.session_state.evaluation_jobs))
         
         # Setup RAG components
-        retriever, all_docs = setup_rag_components()
+        retriever, chunk_store = setup_rag_components()
         
         # Render sidebar and get selected language
-        selected_language = render_sidebar()
+        selected_language = render_sidebar(eval_queue)
         
         # Get current chat messages
         current_chat = st.session_state.chats[st.session_state.current_chat_id]
         messages = current_chat["messages"]
         
-        # Create chains with selected language
-        chains = create_rag_chain(llm, retriever, selected_language)
+        # Limit retrieval to the selected vendor/technology namespace
+        retriever = scope_retriever(retriever, st.session_state.selected_vendor, st.session_state.selected_technology)
+        
+        # Check for bulk alarm triage page
+        if st.session_state.view_triage:
+            render_triage_page(llm, retriever, selected_language)
+            if st.button("Back to Chat", key="back_from_triage"):
+                st.session_state.view_triage = False
+                st.rerun()
+            return
+        
+        # Create chains with selected language, optionally reusing canonical English answers
+        if st.session_state.canonical_answers:
+            chains = create_canonical_rag_chain(llm, retriever, selected_language, get_answer_cache())
+        else:
+            chains = create_rag_chain(llm, retriever, selected_language)
         
         # Display chat history
         display_chat(messages)
 
-        # Handle evaluation display if evaluation is complete
-        if st.session_state.evaluation_complete and st.session_state.evaluation_results_data:
-            st.subheader("✅ Evaluation Results")
-            display_evaluation_results(st.session_state.evaluation_results_data)
-
         # Handle evaluation input if waiting for ground truth
-        elif st.session_state.awaiting_evaluation and st.session_state.current_evaluation_data:
+        if st.session_state.awaiting_evaluation and st.session_state.current_evaluation_data:
             st.subheader("✅ Evaluation")
             with st.form("eval_form"):
                 st.write("Please provide the ground truth for this query to evaluate the response:")
@@ -86,33 +104,24 @@ def main():
                 
                 submitted = st.form_submit_button("Submit & Evaluate")
                 if submitted:
-                    with st.spinner("Evaluating..."):
-                        # Get stored evaluation data
-                        eval_data = st.session_state.current_evaluation_data
-                        
-                        # Run evaluation
-                        eval_results = evaluator.evaluate_rag(
-                            question=eval_data["question"],
-                            answer=eval_data["answer"],
-                            contexts=eval_data["contexts"],
-                            ground_truth=ground_truth
-                        )
-                        
-                        # Add metadata
-                        eval_results['question'] = eval_data["question"]
-                        eval_results['answer'] = eval_data["answer"]
-                        eval_results['retrieved_contexts'] = eval_data["contexts"]
-                        eval_results['ground_truth'] = ground_truth
-                        eval_results['timestamp'] = config['get_timestamp_iso']()
-                        
-                        # Store results
-                        st.session_state.evaluation_results.append(eval_results)
-                        
-                        # Update state to show results
-                        st.session_state.evaluation_complete = True
-                        st.session_state.awaiting_evaluation = False
-                        st.session_state.evaluation_results_data = eval_results
-                        st.rerun()
+                    # Get stored evaluation data
+                    eval_data = st.session_state.current_evaluation_data
+                    
+                    # Queue evaluation in the background so chatting can resume
+                    job_id = eval_queue.submit(
+                        evaluator,
+                        question=eval_data["question"],
+                        answer=eval_data["answer"],
+                        contexts=eval_data["contexts"],
+                        ground_truth=ground_truth,
+                        chat_id=st.session_state.current_chat_id
+                    )
+                    st.session_state.evaluation_jobs.append(job_id)
+                    
+                    # Resume the conversation immediately
+                    st.session_state.awaiting_evaluation = False
+                    st.session_state.current_evaluation_data = None
+                    st.rerun()
 
         # Handle user input if not in middle of evaluation
         elif not st.session_state.awaiting_evaluation:
@@ -27,6 +27,14 @@ def load_configuration() -> Dict[str, Any]:
         'pdf_dir': "pdf files",
         'chunk_size': 300,
         'chunk_overlap': 50,
+        'chunk_store_dir': os.getenv('CHUNK_STORE_DIR', '.chunk_store'),
+        'embedding_model': "all-MiniLM-L6-v2",
+        'retrieval_k': 4,
+        'retrieval_service': os.getenv('RETRIEVAL_SERVICE', ''),
+        'evaluation_db': os.getenv('EVALUATION_DB', 'evaluations.sqlite3'),
+        'evaluation_workers': int(os.getenv('EVALUATION_WORKERS', '2')),
+        'canonical_answers': os.getenv('CANONICAL_ANSWERS', 'false').lower() == 'true',
+        'answer_cache_db': os.getenv('ANSWER_CACHE_DB', 'answer_cache.sqlite3'),
         'get_timestamp': get_timestamp,
         'get_timestamp_iso': get_timestamp_iso,
         'model_setup': setup_model
@@ -7,13 +7,33 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 class GeminiRagasEvaluator:
     def __init__(self, google_api_key: str):
         genai.configure(api_key=google_api_key)
+        # Scores go through this client rather than genai.GenerativeModel, whose process-wide
+        # configuration holds whichever session's key was set last
         self.llm = ChatGoogleGenerativeAI(
             model="gemini-1.5-flash",
             google_api_key=google_api_key,
             convert_system_message_to_human=True
         )
 
-    def evaluate_faithfulness(self, answer: str, contexts: List[str]) -> float:
+    @staticmethod
+    def _parse_score(score_text: str, metric: str, errors: Optional[List[str]] = None) -> float:
+        """
+        Parse a 0-1 score, falling back to 0.5 when the model returns something else.
+        Parse failures are appended to ``errors`` when given (background jobs have no
+        Streamlit context to show them), otherwise shown with st.error
+        """
+        try:
+            score = float(score_text)
+            return max(0.0, min(1.0, score))  # Ensure score is between 0 and 1
+        except ValueError:
+            message = f"Failed to parse {metric} score: {score_text}"
+            if errors is None:
+                st.error(message)
+            else:
+                errors.append(message)
+            return 0.5  # Default middle score
+
+    def evaluate_faithfulness(self, answer: str, contexts: List[str], errors: Optional[List[str]] = None) -> float:
         """
         Evaluate if the answer is faithful to the given contexts
         Returns a score between 0 and 1
@@ -36,16 +56,10 @@ class GeminiRagasEvaluator:
 
         Return only the numerical score without any explanation.
         """
-        response = genai.GenerativeModel("gemini-1.5-flash").generate_content(prompt)
-        score_text = response.text.strip()
-        try:
-            score = float(score_text)
-            return max(0.0, min(1.0, score))  # Ensure score is between 0 and 1
-        except ValueError:
-            st.error(f"Failed to parse faithfulness score: {score_text}")
-            return 0.5  # Default middle score
+        response = self.llm.invoke(prompt)
+        return self._parse_score(response.content.strip(), "faithfulness", errors)
 
-    def evaluate_relevance(self, question: str, contexts: List[str]) -> float:
+    def evaluate_relevance(self, question: str, contexts: List[str], errors: Optional[List[str]] = None) -> float:
         """
         Evaluate if the retrieved contexts are relevant to the question
         Returns a score between 0 and 1
@@ -68,16 +82,10 @@ class GeminiRagasEvaluator:
 
         Return only the numerical score without any explanation.
         """
-        response = genai.GenerativeModel("gemini-1.5-flash").generate_content(prompt)
-        score_text = response.text.strip()
-        try:
-            score = float(score_text)
-            return max(0.0, min(1.0, score))  # Ensure score is between 0 and 1
-        except ValueError:
-            st.error(f"Failed to parse relevance score: {score_text}")
-            return 0.5  # Default middle score
+        response = self.llm.invoke(prompt)
+        return self._parse_score(response.content.strip(), "relevance", errors)
 
-    def evaluate_contextual_precision(self, answer: str, question: str, contexts: List[str]) -> float:
+    def evaluate_contextual_precision(self, answer: str, question: str, contexts: List[str], errors: Optional[List[str]] = None) -> float:
         """
         Evaluate if the answer uses relevant parts of the contexts efficiently
         Returns a score between 0 and 1
@@ -103,16 +111,10 @@ class GeminiRagasEvaluator:
 
         Return only the numerical score without any explanation.
         """
-        response = genai.GenerativeModel("gemini-1.5-flash").generate_content(prompt)
-        score_text = response.text.strip()
-        try:
-            score = float(score_text)
-            return max(0.0, min(1.0, score))  # Ensure score is between 0 and 1
-        except ValueError:
-            st.error(f"Failed to parse contextual precision score: {score_text}")
-            return 0.5  # Default middle score
+        response = self.llm.invoke(prompt)
+        return self._parse_score(response.content.strip(), "contextual precision", errors)
 
-    def evaluate_answer_correctness(self, answer: str, ground_truth: str) -> float:
+    def evaluate_answer_correctness(self, answer: str, ground_truth: str, errors: Optional[List[str]] = None) -> float:
         """
         Evaluate if the answer is correct compared to the ground truth
         Returns a score between 0 and 1
@@ -135,28 +137,22 @@ class GeminiRagasEvaluator:
 
         Return only the numerical score without any explanation.
         """
-        response = genai.GenerativeModel("gemini-1.5-flash").generate_content(prompt)
-        score_text = response.text.strip()
-        try:
-            score = float(score_text)
-            return max(0.0, min(1.0, score))  # Ensure score is between 0 and 1
-        except ValueError:
-            st.error(f"Failed to parse correctness score: {score_text}")
-            return 0.5  # Default middle score
+        response = self.llm.invoke(prompt)
+        return self._parse_score(response.content.strip(), "correctness", errors)
 
-    def evaluate_rag(self, question: str, answer: str, contexts: List[str], ground_truth: str = None) -> Dict[str, float]:
+    def evaluate_rag(self, question: str, answer: str, contexts: List[str], ground_truth: str = None, errors: Optional[List[str]] = None) -> Dict[str, float]:
         """
         Comprehensive evaluation of a RAG system response
         """
         results = {
-            "faithfulness": self.evaluate_faithfulness(answer, contexts),
-            "relevance": self.evaluate_relevance(question, contexts),
-            "contextual_precision": self.evaluate_contextual_precision(answer, question, contexts),
+            "faithfulness": self.evaluate_faithfulness(answer, contexts, errors),
+            "relevance": self.evaluate_relevance(question, contexts, errors),
+            "contextual_precision": self.evaluate_contextual_precision(answer, question, contexts, errors),
         }
 
         # Only evaluate correctness if ground truth is provided
         if ground_truth:
-            results["answer_correctness"] = self.evaluate_answer_correctness(answer, ground_truth)
+            results["answer_correctness"] = self.evaluate_answer_correctness(answer, ground_truth, errors)
 
         # Calculate average score
         results["average_score"] = sum(results.values()) / len(results)
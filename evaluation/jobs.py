@@ -0,0 +1,266 @@
+import os
+import json
+import math
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+from config.settings import get_timestamp_iso, load_configuration
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluation_jobs (
+    id TEXT PRIMARY KEY,
+    chat_id TEXT,
+    status TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    contexts TEXT NOT NULL,
+    ground_truth TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    results TEXT,
+    error TEXT,
+    owner TEXT,
+    lease_expires_at REAL
+)
+"""
+
+# Columns added after the first release, migrated into existing databases
+MIGRATED_COLUMNS = {"owner": "TEXT", "lease_expires_at": "REAL"}
+
+# Running jobs whose owner stops renewing the lease for this long are reclaimed
+LEASE_SECONDS = 120
+
+# Attempts at writing a finished job's result before giving up on it
+FINISH_ATTEMPTS = 5
+
+logger = logging.getLogger(__name__)
+
+class EvaluationQueue:
+    """Persistent background queue for RAG evaluations.
+
+    Jobs and results are stored in SQLite so they survive reruns and server
+    restarts, and are evaluated on a small thread pool so chatting never
+    waits on the evaluator's LLM calls. Several processes can share the
+    database: a job is claimed atomically, and its owner renews a lease
+    while it runs, so only jobs of dead processes are picked up again.
+
+    Jobs only ever run with the evaluator (and so the API key) of the session
+    that submitted them: expired jobs are put back in the queue, and each
+    session resumes its own queued jobs.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 2):
+        self.db_path = db_path
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="evaluation")
+        # Jobs waiting in or running on this process's pool, and the subset currently evaluating
+        self._scheduled: Set[str] = set()
+        self._executing: Set[str] = set()
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(evaluation_jobs)")}
+            for column, column_type in MIGRATED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE evaluation_jobs ADD COLUMN {column} {column_type}")
+        self._reclaim_expired()
+        threading.Thread(target=self._heartbeat, name="evaluation-lease", daemon=True).start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, evaluator: Any, question: str, answer: str, contexts: List[str], ground_truth: str, chat_id: Optional[str] = None) -> str:
+        """Persist an evaluation job, schedule it and return its ID."""
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO evaluation_jobs (id, chat_id, status, question, answer, contexts, ground_truth, submitted_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, chat_id, question, answer, json.dumps(contexts), ground_truth, time.time())
+            )
+        self._schedule(evaluator, job_id)
+        return job_id
+
+    def _schedule(self, evaluator: Any, job_id: str) -> None:
+        with self._lock:
+            if job_id in self._scheduled:
+                return
+            self._scheduled.add(job_id)
+        self._executor.submit(self._run, evaluator, job_id)
+
+    def resume_pending(self, evaluator: Any, job_ids: List[str]) -> int:
+        """Schedule the session's queued jobs, including ones reclaimed from dead processes."""
+        if not job_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id FROM evaluation_jobs WHERE status = 'queued' AND id IN ({placeholders})", list(job_ids)
+            ).fetchall()
+        # Jobs also scheduled by another live process are harmless; only one claim succeeds
+        for row in rows:
+            self._schedule(evaluator, row["id"])
+        return len(rows)
+
+    def needs_resume(self, job_ids: List[str]) -> bool:
+        """Whether any of the given jobs is queued but not scheduled in this process."""
+        with self._lock:
+            unscheduled = [job_id for job_id in job_ids if job_id not in self._scheduled]
+        return any(job["status"] == "queued" for job in self.get_jobs(unscheduled))
+
+    def _reclaim_expired(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE evaluation_jobs SET status = 'queued', owner = NULL, started_at = NULL, lease_expires_at = NULL "
+                "WHERE status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (time.time(),)
+            )
+
+    def _heartbeat(self) -> None:
+        """Renew the leases of jobs evaluating in this process and requeue expired ones."""
+        while True:
+            time.sleep(LEASE_SECONDS / 4)
+            with self._lock:
+                executing = list(self._executing)
+            try:
+                if executing:
+                    placeholders = ", ".join("?" for _ in executing)
+                    with self._lock, self._connect() as conn:
+                        conn.execute(
+                            f"UPDATE evaluation_jobs SET lease_expires_at = ? "
+                            f"WHERE status = 'running' AND owner = ? AND id IN ({placeholders})",
+                            (time.time() + LEASE_SECONDS, self.owner, *executing)
+                        )
+                self._reclaim_expired()
+            except sqlite3.Error:
+                # Busy database; the lease still has three renewals of slack
+                continue
+
+    def _claim(self, job_id: str) -> bool:
+        """Atomically move a queued job to running under this process's lease."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE evaluation_jobs SET status = 'running', owner = ?, started_at = ?, lease_expires_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (self.owner, now, now + LEASE_SECONDS, job_id)
+            )
+        return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, **fields: Any) -> None:
+        """Write a finished job's result, retrying while the database is busy.
+
+        Skips the write if the lease expired and another process took the job
+        over. If every attempt fails the job is left to expire and be retried.
+        """
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        for attempt in range(FINISH_ATTEMPTS):
+            try:
+                with self._lock, self._connect() as conn:
+                    conn.execute(
+                        f"UPDATE evaluation_jobs SET {assignments}, lease_expires_at = NULL WHERE id = ? AND owner = ?",
+                        (*fields.values(), job_id, self.owner)
+                    )
+                return
+            except sqlite3.Error as e:
+                if attempt == FINISH_ATTEMPTS - 1:
+                    logger.error("Could not record evaluation job %s, leaving it to be reclaimed: %s", job_id, e)
+                    return
+                time.sleep(2 ** attempt)
+
+    def _run(self, evaluator: Any, job_id: str) -> None:
+        try:
+            if self._claim(job_id):
+                with self._lock:
+                    self._executing.add(job_id)
+                self._evaluate(evaluator, job_id)
+        finally:
+            # Once it leaves _executing its lease is no longer renewed
+            with self._lock:
+                self._executing.discard(job_id)
+                self._scheduled.discard(job_id)
+
+    def _evaluate(self, evaluator: Any, job_id: str) -> None:
+        job = self.get_job(job_id)
+        # Score parse failures are recorded on the job; st.error has no effect off the script thread
+        parse_errors: List[str] = []
+        try:
+            eval_results = evaluator.evaluate_rag(
+                question=job["question"],
+                answer=job["answer"],
+                contexts=job["contexts"],
+                ground_truth=job["ground_truth"],
+                errors=parse_errors
+            )
+            # Add metadata
+            eval_results['question'] = job["question"]
+            eval_results['answer'] = job["answer"]
+            eval_results['retrieved_contexts'] = job["contexts"]
+            eval_results['ground_truth'] = job["ground_truth"]
+            eval_results['timestamp'] = get_timestamp_iso()
+            self._finish(
+                job_id, status="done", finished_at=time.time(), results=json.dumps(eval_results),
+                error="; ".join(parse_errors) or None
+            )
+        except Exception as e:
+            self._finish(job_id, status="failed", finished_at=time.time(), error=str(e))
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["contexts"] = json.loads(job["contexts"])
+        job["results"] = json.loads(job["results"]) if job["results"] else None
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single job, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM evaluation_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def get_jobs(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        """Return the given jobs, newest first."""
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM evaluation_jobs WHERE id IN ({placeholders}) ORDER BY submitted_at DESC",
+                list(job_ids)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by status and latency of finished jobs."""
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM evaluation_jobs GROUP BY status").fetchall())
+            timings = conn.execute(
+                "SELECT started_at - submitted_at, finished_at - submitted_at FROM evaluation_jobs "
+                "WHERE status = 'done' ORDER BY finished_at DESC LIMIT 100"
+            ).fetchall()
+        waits = sorted(row[0] for row in timings)
+        latencies = sorted(row[1] for row in timings)
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+            "avg_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency": latencies[math.ceil(0.95 * len(latencies)) - 1] if latencies else 0.0
+        }
+
+@st.cache_resource
+def get_evaluation_queue() -> EvaluationQueue:
+    """Return the process-wide evaluation queue."""
+    config = load_configuration()
+    return EvaluationQueue(config['evaluation_db'], max_workers=config['evaluation_workers'])
@@ -0,0 +1,234 @@
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import streamlit as st
+from typing import Any, Dict, List, Optional
+from langchain.prompts import ChatPromptTemplate
+from langchain.schema import Document
+from langchain.schema.retriever import BaseRetriever
+from langchain.schema.language_model import BaseLanguageModel
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.output_parsers import StrOutputParser
+from config.settings import load_configuration
+from models.clustering import Identifiers, fill_identifiers, mask_identifiers
+from models.rag import create_answer_chains
+from utils.helpers import is_history_related_question
+
+CANONICAL_LANGUAGE = "English"
+
+# Follow-up wording, checked on the English question, that makes an answer depend on earlier turns
+FOLLOW_UP_KEYWORDS = ("again", "above", "summar", "that alarm", "this alarm", "those steps", "these steps", "same site")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answer_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+class AnswerCache:
+    """SQLite-backed cache of canonical answers and translations, shared by all workers.
+
+    Also keeps per-process counters comparing what was spent against what
+    generating every answer directly in the requested language would cost.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys([
+            "requests", "canonical_hits", "translation_hits", "llm_calls",
+            "tokens_spent", "tokens_baseline", "latency_spent", "latency_baseline"
+        ], 0)
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM answer_cache WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO answer_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+
+    def record(self, **counters: float) -> None:
+        with self._lock:
+            for name, value in counters.items():
+                self._stats[name] += value
+
+    def stats(self) -> Dict[str, float]:
+        """Hit rates plus latency and token savings against per-language generation."""
+        with self._lock:
+            stats = dict(self._stats)
+        requests = stats["requests"] or 1
+        stats["canonical_hit_rate"] = stats["canonical_hits"] / requests
+        stats["tokens_saved"] = stats["tokens_baseline"] - stats["tokens_spent"]
+        stats["latency_saved"] = stats["latency_baseline"] - stats["latency_spent"]
+        stats["avg_latency"] = stats["latency_spent"] / requests
+        stats["avg_latency_baseline"] = stats["latency_baseline"] / requests
+        return stats
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Count LLM calls and tokens, estimating from text length when usage metadata is missing."""
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens = 0
+        self._prompt_chars = 0
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs: Any) -> None:
+        self._prompt_chars = sum(len(str(message.content)) for batch in messages for message in batch)
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        self.calls += 1
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.tokens += usage.get("total_tokens", 0)
+                else:
+                    # Roughly four characters per token
+                    self.tokens += (self._prompt_chars + len(generation.text)) // 4
+
+def canonical_key(chain_type: str, question_template: str, docs: List[Document], history_template: str) -> str:
+    """Cache key for an answer: normalized question, retrieved chunks and any masked history it depends on."""
+    chunks = [doc.metadata.get("chunk_id", doc.page_content) for doc in docs]
+    payload = json.dumps([chain_type, question_template, chunks, history_template], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CanonicalAnswerChain:
+    """Drop-in replacement for a retrieval chain that answers once in English and translates.
+
+    The question is translated to English (cached) so MiniLM retrieval sees
+    English text, the canonical answer is cached per normalized question and
+    retrieval result, and other languages are served through a cached
+    translation of that answer. Site, cell, IP address and timestamp
+    identifiers are masked in the keys and filled back into the question
+    translation and the answer; numbers stay in the keys.
+
+    Standalone questions are answered without the chat history, so their
+    answers can be shared across conversations. Follow-ups are answered with
+    it, and the earlier turns (masked) become part of the key, so a follow-up
+    is only reused for a conversation with the same prior turns.
+    """
+
+    def __init__(self, llm: BaseLanguageModel, retriever: BaseRetriever, language: str, chain_type: str, cache: AnswerCache):
+        self.retriever = retriever
+        self.language = language
+        self.chain_type = chain_type
+        self.cache = cache
+        self.answer_chain = create_answer_chains(llm, CANONICAL_LANGUAGE)[chain_type]
+        self.translate_chain = ChatPromptTemplate.from_template(
+            """
+            Translate the following Telecom NOC text into {language}.
+            Keep the structure, numbering, alarm names, ticket references and technical terms unchanged.
+            If the text is already in {language}, return it unchanged.
+            Return only the translation.
+
+            Text:
+            {text}
+            """
+        ) | llm | StrOutputParser()
+
+    def _translate(self, key: str, text: str, language: str, config: Dict[str, Any], identifiers: Identifiers) -> str:
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.record(translation_hits=1)
+            return fill_identifiers(cached["text"], cached["identifiers"], identifiers)
+        translated = self.translate_chain.invoke({"text": text, "language": language}, config=config)
+        self.cache.put(key, {"text": translated, "identifiers": identifiers})
+        return translated
+
+    @staticmethod
+    def _prior_history(history: str, question: str) -> str:
+        # generate_response formats the history after appending the current prompt
+        current_turn = f"Human: {question}"
+        if history.endswith(current_turn):
+            history = history[:-len(current_turn)]
+        return history.strip()
+
+    @staticmethod
+    def _is_follow_up(english_question: str) -> bool:
+        text = english_question.lower()
+        return is_history_related_question(text) or any(keyword in text for keyword in FOLLOW_UP_KEYWORDS)
+
+    def invoke(self, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        usage = TokenUsageHandler()
+        config = {**(config or {}), "callbacks": list((config or {}).get("callbacks") or []) + [usage]}
+        question = inputs["input"]
+        history = inputs.get("chat_history", "")
+
+        template, identifiers = mask_identifiers(question)
+        english_question = question
+        if self.language != CANONICAL_LANGUAGE:
+            question_key = "question:" + hashlib.sha256(template.encode("utf-8")).hexdigest()
+            english_question = self._translate(question_key, question, CANONICAL_LANGUAGE, config, identifiers)
+
+        retrieval_start = time.perf_counter()
+        docs = self.retriever.invoke(english_question, config=config)
+        retrieval_latency = time.perf_counter() - retrieval_start
+
+        template, identifiers = mask_identifiers(english_question)
+        prior_history = self._prior_history(history, question)
+        history_template = ""
+        if prior_history and self._is_follow_up(english_question):
+            history_template, history_identifiers = mask_identifiers(prior_history)
+            identifiers = identifiers + history_identifiers
+        else:
+            # Standalone question: answer it without the history so the answer can be shared
+            history = ""
+        key = canonical_key(self.chain_type, template, docs, history_template)
+        canonical = self.cache.get(key)
+        if canonical is None:
+            generation_start, tokens_before = time.perf_counter(), usage.tokens
+            text = self.answer_chain.invoke(
+                {"input": english_question, "chat_history": history, "context": docs}, config=config
+            )
+            canonical = {
+                "text": text,
+                "identifiers": identifiers,
+                "latency": time.perf_counter() - generation_start,
+                "tokens": usage.tokens - tokens_before
+            }
+            self.cache.put(key, canonical)
+        else:
+            self.cache.record(canonical_hits=1)
+
+        answer = canonical["text"]
+        if self.language != CANONICAL_LANGUAGE:
+            answer = self._translate(f"{key}:{self.language}", answer, self.language, config, canonical["identifiers"])
+        answer = fill_identifiers(answer, canonical["identifiers"], identifiers)
+
+        # Baseline: retrieval plus one full generation in the requested language
+        self.cache.record(
+            requests=1,
+            llm_calls=usage.calls,
+            tokens_spent=usage.tokens,
+            tokens_baseline=canonical["tokens"],
+            latency_spent=time.perf_counter() - start,
+            latency_baseline=retrieval_latency + canonical["latency"]
+        )
+        return {"input": question, "chat_history": inputs.get("chat_history", ""), "context": docs, "answer": answer}
+
+def create_canonical_rag_chain(llm: BaseLanguageModel, retriever: BaseRetriever, language: str, cache: AnswerCache) -> Dict[str, Any]:
+    """Create alarm/general chains that reuse canonical English answers across languages."""
+    return {
+        'alarm': CanonicalAnswerChain(llm, retriever, language, 'alarm', cache),
+        'general': CanonicalAnswerChain(llm, retriever, language, 'general', cache)
+    }
+
+@st.cache_resource
+def get_answer_cache() -> AnswerCache:
+    """Return the process-wide canonical answer cache."""
+    return AnswerCache(load_configuration()['answer_cache_db'])
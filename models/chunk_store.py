@@ -0,0 +1,124 @@
+import json
+import mmap
+import os
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from langchain_core.documents import Document
+from models.namespaces import GENERIC, NAMESPACE_FIELDS
+
+# On-disk layout of a chunk store directory
+TEXT_FILE = "chunks.bin"
+OFFSETS_FILE = "offsets.npy"
+PAGES_FILE = "pages.npy"
+SOURCE_IDS_FILE = "source_ids.npy"
+MANIFEST_FILE = "manifest.json"
+LABELS_FILE = "{field}_ids.npy"
+
+class ChunkStoreWriter:
+    """Append chunks to a store directory without keeping them in memory."""
+    __slots__ = ("path", "_text", "_offsets", "_pages", "_source_ids", "_sources", "_source_index", "_label_ids", "_labels")
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._text = open(os.path.join(path, TEXT_FILE), "wb")
+        self._offsets = array("q", [0])
+        self._pages = array("i")
+        self._source_ids = array("i")
+        self._sources: List[str] = []
+        self._source_index: Dict[str, int] = {}
+        self._label_ids = {field: array("h") for field in NAMESPACE_FIELDS}
+        self._labels: Dict[str, List[str]] = {field: [] for field in NAMESPACE_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def add(self, text: str, source: str, page: int, namespace: Optional[Dict[str, str]] = None) -> int:
+        """Append a chunk with optional vendor/technology/doc_type tags and return its chunk ID."""
+        data = text.encode("utf-8")
+        self._text.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+        if source not in self._source_index:
+            self._source_index[source] = len(self._sources)
+            self._sources.append(source)
+        self._source_ids.append(self._source_index[source])
+        self._pages.append(page)
+        for field in NAMESPACE_FIELDS:
+            label = (namespace or {}).get(field, GENERIC)
+            labels = self._labels[field]
+            if label not in labels:
+                labels.append(label)
+            self._label_ids[field].append(labels.index(label))
+        return len(self._pages) - 1
+
+    def close(self, manifest: Optional[Dict[str, Any]] = None) -> None:
+        """Flush text and metadata tables to disk."""
+        if not self._pages:
+            self._text.close()
+            raise ValueError(f"No chunks were written to {self.path}")
+        self._text.close()
+        np.save(os.path.join(self.path, OFFSETS_FILE), np.frombuffer(self._offsets, dtype=np.int64))
+        np.save(os.path.join(self.path, PAGES_FILE), np.frombuffer(self._pages, dtype=np.int32))
+        np.save(os.path.join(self.path, SOURCE_IDS_FILE), np.frombuffer(self._source_ids, dtype=np.int32))
+        for field in NAMESPACE_FIELDS:
+            np.save(os.path.join(self.path, LABELS_FILE.format(field=field)), np.frombuffer(self._label_ids[field], dtype=np.int16))
+        with open(os.path.join(self.path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump({**(manifest or {}), "count": len(self), "sources": self._sources, "labels": self._labels}, f)
+
+class ChunkStore:
+    """Read-only chunk store backed by a memory-mapped text file.
+
+    Chunk text lives in a single file shared through the OS page cache, so
+    every process opening the same store reuses the same physical pages.
+    Metadata is kept in flat arrays and ``Document`` objects are only built
+    for the chunks that are actually requested.
+    """
+    __slots__ = ("path", "manifest", "_file", "_text", "_offsets", "_pages", "_source_ids", "_sources", "_label_ids")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+        self._sources: List[str] = self.manifest["sources"]
+        self._file = open(os.path.join(path, TEXT_FILE), "rb")
+        self._text = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r")
+        self._pages = np.load(os.path.join(path, PAGES_FILE), mmap_mode="r")
+        self._source_ids = np.load(os.path.join(path, SOURCE_IDS_FILE), mmap_mode="r")
+        self._label_ids = {
+            field: np.load(os.path.join(path, LABELS_FILE.format(field=field)), mmap_mode="r")
+            for field in NAMESPACE_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def text(self, chunk_id: int) -> str:
+        """Return the text of a single chunk."""
+        start, end = int(self._offsets[chunk_id]), int(self._offsets[chunk_id + 1])
+        return self._text[start:end].decode("utf-8")
+
+    def metadata(self, chunk_id: int) -> Dict[str, Any]:
+        """Return the metadata of a single chunk."""
+        metadata = {
+            "source": self._sources[int(self._source_ids[chunk_id])],
+            "page": int(self._pages[chunk_id]),
+            "chunk_id": int(chunk_id)
+        }
+        for field in NAMESPACE_FIELDS:
+            metadata[field] = self.manifest["labels"][field][int(self._label_ids[field][chunk_id])]
+        return metadata
+
+    def document(self, chunk_id: int) -> Document:
+        """Materialize a single chunk as a LangChain ``Document``."""
+        return Document(page_content=self.text(chunk_id), metadata=self.metadata(chunk_id))
+
+    def documents(self, chunk_ids: Iterable[int]) -> List[Document]:
+        """Materialize the given chunks, skipping FAISS padding IDs (-1)."""
+        return [self.document(int(i)) for i in chunk_ids if i >= 0]
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        self._text.close()
+        self._file.close()
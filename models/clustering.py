@@ -0,0 +1,120 @@
+import re
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from models.namespaces import infer_namespace
+
+# Identifier kinds masked out of alarm texts, most specific first
+IDENTIFIER_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("TIMESTAMP", re.compile(r"\b\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?(?:\.\d+)?Z?\b")),
+    # Before dotted dates, which would otherwise match the first three octets of an address
+    ("IP", re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")),
+    ("TIMESTAMP", re.compile(r"\b\d{1,2}[/.]\d{1,2}[/.]\d{2,4}(?:\s+\d{1,2}:\d{2}(?::\d{2})?)?\b")),
+    # The node type prefix stays in the template (<site:enb>) so eNB and gNB alarms never merge
+    ("SITE", re.compile(r"\b(?P<prefix>RBS|BTS|ENB|GNB|NODEB|SITE|BSC|RNC)[-_]?\d+[A-Z0-9_-]*\b", re.IGNORECASE)),
+    # Cell/object names: 5+ character tokens mixing letters and at least two digits (not "S1", "5G")
+    ("CELL", re.compile(r"\b(?=[A-Za-z0-9_-]{5,})(?=(?:[A-Za-z_-]*\d){2})(?=[A-Za-z0-9_-]*[A-Za-z])[A-Za-z0-9]+(?:[_-][A-Za-z0-9]+)*\b"))
+]
+# Bare numbers (board slots, temperatures, thresholds) are deliberately left in the
+# template: "Board 3 faulty" and "Board 30 faulty" are different alarms
+
+Identifiers = List[Tuple[str, str]]
+
+def mask_identifiers(text: str) -> Tuple[str, Identifiers]:
+    """Replace site IDs, cell names, IP addresses and timestamps with placeholders.
+
+    Returns the template and the masked (kind, value) pairs in order of appearance.
+    """
+    found: List[Tuple[int, int, str, str, str]] = []
+    taken = bytearray(len(text))
+    for kind, pattern in IDENTIFIER_PATTERNS:
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if not any(taken[start:end]):
+                taken[start:end] = b"\x01" * (end - start)
+                prefix = match.groupdict().get("prefix")
+                placeholder = f"{kind}:{prefix}" if prefix else kind
+                found.append((start, end, kind, placeholder, match.group()))
+    found.sort()
+    template, identifiers, last = [], [], 0
+    for start, end, kind, placeholder, value in found:
+        template.append(text[last:start])
+        template.append(f"<{placeholder}>")
+        identifiers.append((kind, value))
+        last = end
+    template.append(text[last:])
+    return re.sub(r"\s+", " ", "".join(template)).strip().lower(), identifiers
+
+def fill_identifiers(answer: str, source: Identifiers, target: Identifiers) -> str:
+    """Rewrite an answer written for one alarm with another alarm's identifiers, kind by kind."""
+    by_kind_source, by_kind_target = defaultdict(list), defaultdict(list)
+    for kind, value in source:
+        by_kind_source[kind].append(value)
+    for kind, value in target:
+        by_kind_target[kind].append(value)
+    replacements = {}
+    for kind, olds in by_kind_source.items():
+        for old, new in zip(olds, by_kind_target.get(kind, [])):
+            if old != new and old not in replacements:
+                replacements[old] = new
+    if not replacements:
+        return answer
+    # Single pass so swapped identifiers (A->B, B->A) don't cascade
+    pattern = re.compile("|".join(r"\b" + re.escape(old) + r"\b" for old in sorted(replacements, key=len, reverse=True)))
+    return pattern.sub(lambda match: replacements[match.group()], answer)
+
+def cluster_alarm_texts(
+    texts: List[str],
+    embed: Optional[Callable[[List[str]], np.ndarray]] = None,
+    threshold: float = 0.92
+) -> List[List[int]]:
+    """Group alarm texts that only differ in identifiers or are near-duplicates.
+
+    Texts sharing a masked template always end up together. When ``embed`` is
+    given, templates whose embeddings have cosine similarity of at least
+    ``threshold`` to a cluster leader are merged into that cluster, provided
+    both have the same placeholders, literal numbers and inferred
+    vendor/technology, so identifiers can be filled back one-to-one and no
+    member inherits another alarm's slot or threshold values.
+    """
+    by_template: Dict[str, List[int]] = defaultdict(list)
+    for i, text in enumerate(texts):
+        by_template[mask_identifiers(text)[0]].append(i)
+    # Largest groups lead so the most common issue becomes each cluster's representative
+    groups = sorted(by_template.items(), key=lambda item: (-len(item[1]), item[1][0]))
+    if embed is None or len(groups) < 2:
+        return [members for _, members in groups]
+
+    vectors = np.asarray(embed([template for template, _ in groups]), dtype=np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    # Leaders are only compared within the same placeholder/number/namespace partition
+    partitions = [
+        (tuple(re.findall(r"<[a-z:]+>", template)), tuple(re.findall(r"\b\d+\b", template)), infer_namespace(template))
+        for template, _ in groups
+    ]
+    clusters: List[List[int]] = []
+    # (group index, cluster index) of each leader, per partition
+    leaders: Dict[Tuple, List[Tuple[int, int]]] = defaultdict(list)
+    for g, (_, members) in enumerate(groups):
+        partition_leaders = leaders[partitions[g]]
+        if partition_leaders:
+            similarities = vectors[[leader for leader, _ in partition_leaders]] @ vectors[g]
+            best = int(np.argmax(similarities))
+            if similarities[best] >= threshold:
+                clusters[partition_leaders[best][1]].extend(members)
+                continue
+        partition_leaders.append((g, len(clusters)))
+        clusters.append(list(members))
+    return clusters
+
+def clustering_summary(clusters: List[List[int]]) -> Dict[str, int]:
+    """Cluster counts and LLM calls saved compared to answering every alarm."""
+    alarms = sum(len(members) for members in clusters)
+    return {
+        "alarms": alarms,
+        "clusters": len(clusters),
+        "duplicate_clusters": sum(1 for members in clusters if len(members) > 1),
+        "largest_cluster": max((len(members) for members in clusters), default=0),
+        "llm_calls": len(clusters),
+        "llm_calls_saved": alarms - len(clusters)
+    }
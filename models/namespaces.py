@@ -0,0 +1,122 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Label used for documents that do not belong to a specific vendor/technology;
+# generic shards are searched alongside every filtered query
+GENERIC = "generic"
+
+# Sidebar/retriever scope values besides concrete labels
+AUTO = "Auto"
+ALL = "All"
+
+NAMESPACE_FIELDS = ("vendor", "technology", "doc_type")
+
+VENDOR_KEYWORDS: Dict[str, List[str]] = {
+    "Ericsson": ["ericsson", "enm", "oss-rc"],
+    "Nokia": ["nokia", "netact", "airscale", "flexi"],
+    "Huawei": ["huawei", "u2020", "m2000"]
+}
+
+TECHNOLOGY_KEYWORDS: Dict[str, List[str]] = {
+    "2G": ["2g", "gsm", "bts", "bsc", "gprs", "edge"],
+    "3G": ["3g", "umts", "wcdma", "nodeb", "rnc"],
+    "4G": ["4g", "lte", "enodeb", "enb", "e-utran"],
+    "5G": ["5g", "nr", "new radio", "gnodeb", "gnb", "ng-ran"]
+}
+
+# Tokens that also occur in everyday NOC wording ("cell edge", "nr. of alarms") or
+# in site naming schemes unrelated to the radio technology (ENB_1234 on a 5G
+# site); they can tag a file path but are too weak to tag content or narrow a
+# question's search
+QUERY_IGNORED_KEYWORDS = {"edge", "bts", "enb", "nr"}
+
+DOC_TYPE_KEYWORDS: Dict[str, List[str]] = {
+    "alarm": ["alarm", "alarms", "fault"],
+    "procedure": ["procedure", "mop", "runbook", "sop"],
+    "guide": ["guide", "manual", "handbook", "poc"]
+}
+
+def _patterns(keywords: Dict[str, List[str]], ignored: Iterable[str] = ()) -> Dict[str, re.Pattern]:
+    return {
+        label: re.compile(r"\b(" + "|".join(re.escape(word) for word in words if word not in ignored) + r")\b")
+        for label, words in keywords.items()
+    }
+
+_VENDOR_PATTERNS = _patterns(VENDOR_KEYWORDS)
+_TECHNOLOGY_PATTERNS = _patterns(TECHNOLOGY_KEYWORDS)
+_DOC_TYPE_PATTERNS = _patterns(DOC_TYPE_KEYWORDS)
+_STRICT_VENDOR_PATTERNS = _patterns(VENDOR_KEYWORDS, QUERY_IGNORED_KEYWORDS)
+_STRICT_TECHNOLOGY_PATTERNS = _patterns(TECHNOLOGY_KEYWORDS, QUERY_IGNORED_KEYWORDS)
+
+def _normalize(text: str) -> str:
+    """Lowercase and turn path separators/underscores into word boundaries."""
+    return re.sub(r"[_/\\.]+", " ", text.lower())
+
+# A passing mention in body text shouldn't pin a generic document to one shard
+CONTENT_MIN_HITS = 3
+
+def _best_label(text: str, patterns: Dict[str, re.Pattern], min_hits: int = 1) -> Optional[str]:
+    """Return the label with the most keyword hits, or None if it has fewer than ``min_hits``."""
+    counts = {label: len(pattern.findall(text)) for label, pattern in patterns.items()}
+    label, hits = max(counts.items(), key=lambda item: item[1])
+    return label if hits >= min_hits else None
+
+def _unambiguous_label(text: str, patterns: Dict[str, re.Pattern]) -> Optional[str]:
+    """Return the only label mentioned in the text, or None if none or several are."""
+    labels = [label for label, pattern in patterns.items() if pattern.search(text)]
+    return labels[0] if len(labels) == 1 else None
+
+def tag_document(source: str, text: str, page_text: str = "") -> Dict[str, str]:
+    """Derive vendor, technology and document type for a chunk.
+
+    A label in the file path applies to every chunk of the file. Otherwise the
+    chunk's own text decides when it names exactly one label, and then the
+    surrounding page when one label dominates it, so a guide covering several
+    vendors is split between their shards.
+    """
+    path, content, page = _normalize(source), _normalize(text), _normalize(page_text)
+    tags = {}
+    for field, patterns, content_patterns in (
+        ("vendor", _VENDOR_PATTERNS, _STRICT_VENDOR_PATTERNS),
+        ("technology", _TECHNOLOGY_PATTERNS, _STRICT_TECHNOLOGY_PATTERNS),
+        ("doc_type", _DOC_TYPE_PATTERNS, _DOC_TYPE_PATTERNS)
+    ):
+        tags[field] = (
+            _best_label(path, patterns)
+            or _unambiguous_label(content, content_patterns)
+            or _best_label(page, content_patterns, CONTENT_MIN_HITS)
+            or GENERIC
+        )
+    return tags
+
+def infer_namespace(question: str) -> Tuple[Optional[str], Optional[str]]:
+    """Guess the vendor and technology a question is about.
+
+    Only unambiguous keywords count, and a question mentioning several labels
+    is not narrowed, since a wrong guess hides the relevant shards entirely.
+    """
+    text = _normalize(question)
+    return _unambiguous_label(text, _STRICT_VENDOR_PATTERNS), _unambiguous_label(text, _STRICT_TECHNOLOGY_PATTERNS)
+
+def resolve_namespace(query: str, vendor: str, technology: str) -> Tuple[Optional[str], Optional[str]]:
+    """Turn sidebar scope values into a concrete (vendor, technology) filter; None means any."""
+    inferred_vendor, inferred_technology = infer_namespace(query) if AUTO in (vendor, technology) else (None, None)
+    resolved_vendor = inferred_vendor if vendor == AUTO else None if vendor == ALL else vendor
+    resolved_technology = inferred_technology if technology == AUTO else None if technology == ALL else technology
+    return resolved_vendor, resolved_technology
+
+def shard_key(vendor: str, technology: str) -> str:
+    """Name of the index shard holding a vendor/technology combination."""
+    return f"{vendor}__{technology}"
+
+def select_shards(keys: Iterable[str], vendor: Optional[str], technology: Optional[str]) -> List[str]:
+    """Pick the shards matching a filter, always including generic ones."""
+    selected = []
+    for key in keys:
+        shard_vendor, shard_technology = key.split("__", 1)
+        if vendor and shard_vendor not in (vendor, GENERIC):
+            continue
+        if technology and shard_technology not in (technology, GENERIC):
+            continue
+        selected.append(key)
+    return selected
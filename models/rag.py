@@ -1,31 +1,197 @@
-
+import os
+import json
+import fcntl
+import shutil
+import hashlib
+import numpy as np
+import faiss
 import streamlit as st
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Optional
 from langchain_community.document_loaders import PyPDFDirectoryLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain.schema import AIMessage, HumanMessage, Document
 from langchain.schema.retriever import BaseRetriever
 from langchain.schema.language_model import BaseLanguageModel
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from config.settings import load_configuration
+from models.chunk_store import ChunkStore, ChunkStoreWriter, MANIFEST_FILE
+from models.namespaces import AUTO, resolve_namespace, select_shards, shard_key, tag_document
+from models.retrieval_service import RemoteRetriever
+
+SHARDS_DIR = "shards"
+# Bumped whenever chunk tagging or the on-disk layout changes, forcing a rebuild
+STORE_FORMAT = 3
+EMBED_BATCH_SIZE = 256
+
+class ChunkStoreRetriever(BaseRetriever):
+    """Retriever that searches namespace-sharded FAISS indexes and resolves hits from a ChunkStore.
+
+    ``vendor`` and ``technology`` are either a concrete label, ``ALL`` or
+    ``AUTO`` (inferred from the question); only matching shards are searched.
+    """
+    shards: Dict[str, Any]
+    store: Any
+    embedding: Any
+    k: int = 4
+    vendor: str = AUTO
+    technology: str = AUTO
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        vendor, technology = resolve_namespace(query, self.vendor, self.technology)
+        vector = np.asarray([self.embedding.embed_query(query)], dtype=np.float32)
+        return self.search_vectors(vector, self.k, vendor, technology)[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed many queries in one call."""
+        # HuggingFace embeddings encode queries and documents identically, so one batched call suffices
+        return np.asarray(self.embedding.embed_documents(queries), dtype=np.float32)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        k: Optional[int] = None,
+        vendor: Optional[str] = None,
+        technology: Optional[str] = None
+    ) -> List[List[Document]]:
+        """Embed and search several queries sharing one namespace filter with a single call per shard."""
+        return self.search_vectors(self.embed_queries(queries), k or self.k, vendor, technology)
+
+    def search_vectors(self, vectors: np.ndarray, k: int, vendor: Optional[str], technology: Optional[str]) -> List[List[Document]]:
+        """Search pre-computed query vectors and materialize the top-k documents per query."""
+        return [self.store.documents(row) for row in self._search(vectors, k, vendor, technology)]
+
+    def _search(self, vectors: np.ndarray, k: int, vendor: Optional[str], technology: Optional[str]) -> np.ndarray:
+        """Search the matching shards and merge their hits into global top-k chunk IDs."""
+        # Fall back to the whole corpus if nothing is indexed for the requested namespace
+        keys = select_shards(self.shards.keys(), vendor, technology) or list(self.shards.keys())
+        distances, ids = [], []
+        for key in keys:
+            shard = self.shards[key]
+            shard_distances, shard_ids = shard.search(vectors, min(k, shard.ntotal))
+            distances.append(shard_distances)
+            ids.append(shard_ids)
+        distances, ids = np.hstack(distances), np.hstack(ids)
+        order = np.argsort(distances, axis=1)[:, :k]
+        return np.take_along_axis(ids, order, axis=1)
+
+def _corpus_fingerprint(config: Dict[str, Any]) -> str:
+    """Hash the PDF set and chunking settings so stale stores get rebuilt."""
+    pdf_dir = config['pdf_dir']
+    files = []
+    for name in sorted(os.listdir(pdf_dir)):
+        if name.lower().endswith(".pdf"):
+            stat = os.stat(os.path.join(pdf_dir, name))
+            files.append([name, stat.st_size, int(stat.st_mtime)])
+    payload = json.dumps([STORE_FORMAT, files, config['chunk_size'], config['chunk_overlap'], config['embedding_model']])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _add_embeddings(shards: Dict[str, Any], embedding: HuggingFaceEmbeddings, batch: List[Tuple[int, str, str]]) -> None:
+    """Embed a batch of (chunk ID, shard key, text) once and route the vectors to their shards."""
+    vectors = np.asarray(embedding.embed_documents([text for _, _, text in batch]), dtype=np.float32)
+    chunk_ids = np.asarray([chunk_id for chunk_id, _, _ in batch], dtype=np.int64)
+    keys = np.asarray([key for _, key, _ in batch])
+    for key in sorted(set(keys.tolist())):
+        mask = keys == key
+        if key not in shards:
+            # Index by global chunk ID so shard hits resolve straight into the ChunkStore
+            shards[key] = faiss.IndexIDMap(faiss.IndexFlatL2(vectors.shape[1]))
+        shards[key].add_with_ids(vectors[mask], chunk_ids[mask])
+
+def _build_chunk_store(config: Dict[str, Any], embedding: HuggingFaceEmbeddings, fingerprint: str) -> None:
+    """Stream PDFs through the splitter into a fresh chunk store and sharded FAISS indexes."""
+    store_dir = config['chunk_store_dir']
+    tmp_dir = f"{store_dir}.v-{fingerprint[:12]}-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    writer = ChunkStoreWriter(tmp_dir)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=config['chunk_size'], chunk_overlap=config['chunk_overlap'])
+    shards: Dict[str, Any] = {}
+    batch = []
+    for page in PyPDFDirectoryLoader(config['pdf_dir']).lazy_load():
+        source = page.metadata.get("source", "")
+        for chunk in splitter.split_documents([page]):
+            # Path tags cover the whole file; otherwise each chunk is tagged from its own content
+            namespace = tag_document(source, chunk.page_content, page.page_content)
+            key = shard_key(namespace["vendor"], namespace["technology"])
+            chunk_id = writer.add(chunk.page_content, source, chunk.metadata.get("page", -1), namespace)
+            batch.append((chunk_id, key, chunk.page_content))
+            if len(batch) >= EMBED_BATCH_SIZE:
+                _add_embeddings(shards, embedding, batch)
+                batch = []
+    if batch:
+        _add_embeddings(shards, embedding, batch)
+    writer.close({"fingerprint": fingerprint, "shards": {key: shard.ntotal for key, shard in shards.items()}})
+    os.makedirs(os.path.join(tmp_dir, SHARDS_DIR))
+    for key, shard in shards.items():
+        faiss.write_index(shard, os.path.join(tmp_dir, SHARDS_DIR, f"{key}.faiss"))
+    _publish_store(store_dir, tmp_dir)
+
+def _publish_store(store_dir: str, version_dir: str) -> None:
+    """Atomically point the store symlink at a finished build and drop older builds.
+
+    Readers resolve the symlink once, so they see either the old or the new
+    build, and already-open memory maps stay valid after old builds are removed.
+    """
+    if os.path.isdir(store_dir) and not os.path.islink(store_dir):
+        # Store from before versioned builds; nothing can be swapped atomically over a real directory
+        shutil.rmtree(store_dir)
+    link_tmp = f"{store_dir}.link-{os.getpid()}"
+    if os.path.lexists(link_tmp):
+        os.unlink(link_tmp)
+    os.symlink(os.path.basename(version_dir), link_tmp)
+    os.replace(link_tmp, store_dir)
+    parent, prefix = os.path.dirname(os.path.abspath(store_dir)), os.path.basename(store_dir) + ".v-"
+    for name in os.listdir(parent):
+        if name.startswith(prefix) and name != os.path.basename(version_dir):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+def _store_is_current(store_dir: str, fingerprint: str) -> bool:
+    """Check whether the on-disk store was built from the current corpus."""
+    try:
+        with open(os.path.join(store_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f).get("fingerprint") == fingerprint and os.path.isdir(os.path.join(store_dir, SHARDS_DIR))
+    except (OSError, ValueError):
+        return False
+
+def load_rag_components(config: Dict[str, Any], embedding: Optional[Any] = None) -> Tuple[ChunkStoreRetriever, ChunkStore]:
+    """Load the embedder, chunk store and FAISS shards, building them if stale."""
+    embedding = embedding or HuggingFaceEmbeddings(model_name=config['embedding_model'])
+    fingerprint = _corpus_fingerprint(config)
+    store_dir = config['chunk_store_dir']
+    if not _store_is_current(store_dir, fingerprint):
+        # Only one worker builds; the others wait and then reuse its store
+        with open(f"{store_dir}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not _store_is_current(store_dir, fingerprint):
+                _build_chunk_store(config, embedding, fingerprint)
+    # Resolve the symlink once so the store and its shards come from the same build
+    store_path = os.path.realpath(store_dir)
+    store = ChunkStore(store_path)
+    shards = {
+        key: faiss.read_index(os.path.join(store_path, SHARDS_DIR, f"{key}.faiss"))
+        for key in store.manifest["shards"]
+    }
+    retriever = ChunkStoreRetriever(shards=shards, store=store, embedding=embedding, k=config['retrieval_k'])
+    return retriever, store
+
+def scope_retriever(retriever: BaseRetriever, vendor: str, technology: str) -> BaseRetriever:
+    """Return a copy of the retriever limited to a vendor/technology namespace."""
+    return retriever.copy(update={"vendor": vendor, "technology": technology})
 
 @st.cache_resource
-def setup_rag_components() -> Tuple[BaseRetriever, Any]:
+def setup_rag_components() -> Tuple[BaseRetriever, Optional[ChunkStore]]:
     """Initialize and cache RAG components."""
-    embedding = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    path = "pdf files"
-    loader = PyPDFDirectoryLoader(path)
-    extracted_docs = loader.load()
-    splits = RecursiveCharacterTextSplitter(chunk_size=300, chunk_overlap=50)
-    docs = splits.split_documents(extracted_docs)
-    vector_store = FAISS.from_documents(documents=docs, embedding=embedding)
-    return vector_store.as_retriever(), docs
+    config = load_configuration()
+    if config['retrieval_service']:
+        # Index and embedder live in the shared retrieval service process
+        return RemoteRetriever(address=config['retrieval_service'], k=config['retrieval_k']), None
+    return load_rag_components(config)
 
-def create_rag_chain(llm: BaseLanguageModel, retriever: BaseRetriever, language: str) -> Dict[str, Any]:
-    """Create RAG chains with different prompts for different types of questions."""
+def create_answer_chains(llm: BaseLanguageModel, language: str) -> Dict[str, Any]:
+    """Create the prompt + LLM chains that answer from already retrieved documents."""
     # Alarm-related prompt
     alarm_prompt = ChatPromptTemplate.from_template(
         f"""
@@ -71,10 +237,15 @@ def create_rag_chain(llm: BaseLanguageModel, retriever: BaseRetriever, language:
     )
     
     # Create chains
-    alarm_chain = create_stuff_documents_chain(llm, alarm_prompt)
-    general_chain = create_stuff_documents_chain(llm, general_prompt)
-    
     return {
-        'alarm': create_retrieval_chain(retriever, alarm_chain),
-        'general': create_retrieval_chain(retriever, general_chain)
+        'alarm': create_stuff_documents_chain(llm, alarm_prompt),
+        'general': create_stuff_documents_chain(llm, general_prompt)
+    }
+
+def create_rag_chain(llm: BaseLanguageModel, retriever: BaseRetriever, language: str) -> Dict[str, Any]:
+    """Create RAG chains with different prompts for different types of questions."""
+    answer_chains = create_answer_chains(llm, language)
+    return {
+        'alarm': create_retrieval_chain(retriever, answer_chains['alarm']),
+        'general': create_retrieval_chain(retriever, answer_chains['general'])
     }
\ No newline at end of file
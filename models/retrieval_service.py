@@ -0,0 +1,183 @@
+"""Shared retrieval service so Streamlit workers don't each load the index.
+
+Run once per host:
+
+    python -m models.retrieval_service --address unix:/tmp/noc-retrieval.sock
+
+and point the app at it with ``RETRIEVAL_SERVICE=unix:/tmp/noc-retrieval.sock``
+(or ``127.0.0.1:8765`` for TCP). The protocol is one JSON object per line.
+"""
+import os
+import json
+import time
+import queue
+import socket
+import argparse
+import threading
+import socketserver
+from concurrent.futures import Future
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from models.namespaces import AUTO, resolve_namespace
+
+def _connect(address: str, timeout: float) -> socket.socket:
+    """Open a socket to a ``unix:/path`` or ``host:port`` address."""
+    if address.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address[len("unix:"):])
+        return sock
+    host, _, port = address.rpartition(":")
+    return socket.create_connection((host or "127.0.0.1", int(port)), timeout=timeout)
+
+def request_service(address: str, payload: Dict[str, Any], timeout: float = 30.0) -> Dict[str, Any]:
+    """Send one request to the retrieval service and return its response."""
+    with _connect(address, timeout) as sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise ConnectionError(f"Retrieval service at {address} closed the connection")
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(f"Retrieval service error: {response['error']}")
+    return response
+
+class RemoteRetriever(BaseRetriever):
+    """Thin client retriever backed by the shared retrieval service."""
+    address: str
+    k: int = 4
+    timeout: float = 30.0
+    vendor: str = AUTO
+    technology: str = AUTO
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        # Namespace inference is cheap, so resolve it here and let the service batch by shard filter
+        vendor, technology = resolve_namespace(query, self.vendor, self.technology)
+        payload = {"query": query, "k": self.k, "vendor": vendor, "technology": technology}
+        response = request_service(self.address, payload, self.timeout)
+        return [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in response["documents"]]
+
+class BatchingSearcher:
+    """Coalesce concurrent queries into a single batched embed + FAISS search."""
+
+    def __init__(self, retriever: Any, max_batch: int = 64, max_wait: float = 0.005):
+        self.retriever = retriever
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = {"requests": 0, "batches": 0, "max_batch_seen": 0}
+        self._queue: "queue.Queue[Tuple[str, int, Optional[str], Optional[str], Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="retrieval-batcher", daemon=True).start()
+
+    def search(self, query: str, k: int, vendor: Optional[str] = None, technology: Optional[str] = None) -> List[Document]:
+        """Queue a query and block until its batch has been searched."""
+        future: Future = Future()
+        self._queue.put((query, k, vendor, technology, future))
+        return future.result()
+
+    def _collect(self) -> List[Tuple[str, int, Optional[str], Optional[str], Future]]:
+        """Wait for one request, then gather more until the batch fills or the window closes."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # Queries with the same namespace filter share one embed + shard search
+            groups = defaultdict(list)
+            for item in batch:
+                groups[(item[2], item[3])].append(item)
+            for (vendor, technology), group in groups.items():
+                try:
+                    results = self.retriever.search_batch(
+                        [query for query, *_ in group], max(item[1] for item in group), vendor, technology
+                    )
+                    for (_, k, _, _, future), documents in zip(group, results):
+                        future.set_result(documents[:k])
+                except Exception as e:
+                    for *_, future in group:
+                        future.set_exception(e)
+            with self._lock:
+                self.stats["requests"] += len(batch)
+                self.stats["batches"] += len(groups)
+                self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(batch))
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        searcher: BatchingSearcher = self.server.searcher
+        for line in self.rfile:
+            try:
+                payload = json.loads(line)
+                if payload.get("op") == "stats":
+                    response = {"stats": dict(searcher.stats)}
+                else:
+                    documents = searcher.search(
+                        payload["query"],
+                        int(payload.get("k", searcher.retriever.k)),
+                        payload.get("vendor"),
+                        payload.get("technology")
+                    )
+                    response = {"documents": [
+                        {"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents
+                    ]}
+            except Exception as e:
+                response = {"error": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+def create_server(address: str, searcher: BatchingSearcher) -> socketserver.BaseServer:
+    """Bind a threaded server for the given address."""
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if os.path.exists(path):
+            os.unlink(path)
+        server = _UnixServer(path, _RequestHandler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = _TCPServer((host or "127.0.0.1", int(port)), _RequestHandler)
+    server.searcher = searcher
+    return server
+
+def main() -> None:
+    from config.settings import load_configuration
+    from models.rag import load_rag_components
+
+    parser = argparse.ArgumentParser(description="Shared retrieval service for RAN Ops Assist")
+    parser.add_argument("--address", default=os.getenv("RETRIEVAL_SERVICE") or "unix:/tmp/noc-retrieval.sock")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    retriever, _ = load_rag_components(load_configuration())
+    searcher = BatchingSearcher(retriever, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    server = create_server(args.address, searcher)
+    print(f"Retrieval service listening on {args.address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
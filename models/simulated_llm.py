@@ -0,0 +1,42 @@
+import time
+import random
+from typing import Any, List, Optional
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+CANNED_ANSWER = """
+1. Response: Simulated answer based on the retrieved context.
+2. Explanation of the issue: Simulated explanation.
+3. Recommended steps/actions: Simulated recommended steps.
+4. Quality steps to follow: Check for relevant INC/CRQ tickets.
+"""
+
+class SimulatedLatencyChatModel(BaseChatModel):
+    """Local stand-in for Gemini that sleeps for a realistic, randomized latency.
+
+    Latency is drawn from a log-normal distribution around ``mean_latency``
+    seconds, and ``error_rate`` injects failures the way quota or network
+    errors would surface from the real API.
+    """
+    mean_latency: float = 1.5
+    jitter: float = 0.35
+    error_rate: float = 0.0
+    answer: str = CANNED_ANSWER
+
+    @property
+    def _llm_type(self) -> str:
+        return "simulated-latency"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        time.sleep(self.mean_latency * random.lognormvariate(0, self.jitter))
+        if random.random() < self.error_rate:
+            raise RuntimeError("Simulated LLM failure (429 Resource exhausted)")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.answer))])
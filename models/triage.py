@@ -0,0 +1,183 @@
+import io
+import re
+import csv
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from models.namespaces import resolve_namespace
+from models.clustering import cluster_alarm_texts, fill_identifiers, mask_identifiers
+
+# Columns commonly found in OSS alarm exports, in the order they are joined into the alarm text
+ALARM_TEXT_FIELDS = [
+    "alarm_name", "alarm", "specific_problem", "probable_cause",
+    "additional_text", "alarm_text", "description", "managed_object"
+]
+ALARM_DETAIL_FIELDS = ["alarm_id", "site", "site_id", "cell", "cell_name", "node", "severity", "raised_at", "event_time"]
+
+# Numbered sections of the alarm prompt's structured response
+ANSWER_SECTIONS = ["response", "explanation", "recommended_steps", "quality_steps"]
+RESULT_FIELDS = (
+    ["row"] + ALARM_DETAIL_FIELDS + ["alarm_text", "cluster", "cluster_size"]
+    + ANSWER_SECTIONS + ["answer", "sources", "error", "latency"]
+)
+
+def _normalize_key(key: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", key.strip().lower()).strip("_")
+
+def load_alarm_export(data: bytes, filename: str) -> List[Dict[str, str]]:
+    """Parse a CSV or JSON alarm export into records with normalized column names."""
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        payload = json.loads(text)
+        rows = payload.get("alarms", []) if isinstance(payload, dict) else payload
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+    return [
+        {_normalize_key(key): "" if value is None else str(value) for key, value in row.items() if key}
+        for row in rows
+    ]
+
+def alarm_text(record: Dict[str, str]) -> str:
+    """Build the question sent to the alarm chain from an export record."""
+    parts = [record[field] for field in ALARM_TEXT_FIELDS if record.get(field)]
+    if not parts:
+        parts = [f"{key}: {value}" for key, value in record.items() if value]
+    return " - ".join(parts)
+
+# Top-level section heading: unindented "N. Heading:" with optional bold, e.g. "**3. Recommended steps/actions:**"
+SECTION_HEADING = re.compile(r"^(\*\*)?([1-4])\.[ \t]+([^\n:*]{1,60}?)[ \t]*(?:\*\*)?:(?:\*\*)?", re.MULTILINE)
+
+def parse_structured_answer(answer: str) -> Dict[str, str]:
+    """Split the numbered 1-4 sections of an alarm answer into fields.
+
+    Headings are translated with the answer language, so they are matched by
+    shape rather than wording. Numbered lists inside a section are not taken
+    for headings: sections must appear in ascending order, and when the model
+    bolds its headings only bold lines count.
+    """
+    sections = dict.fromkeys(ANSWER_SECTIONS, "")
+    candidates = list(SECTION_HEADING.finditer(answer))
+    if any(match.group(1) for match in candidates):
+        candidates = [match for match in candidates if match.group(1)]
+    headings, last = [], 0
+    for match in candidates:
+        if int(match.group(2)) > last:
+            headings.append(match)
+            last = int(match.group(2))
+    for i, match in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(answer)
+        sections[ANSWER_SECTIONS[int(match.group(2)) - 1]] = answer[match.end():end].strip(" *\n")
+    if not any(sections.values()):
+        sections["response"] = answer.strip()
+    return sections
+
+def retrieve_batch(retriever: BaseRetriever, queries: List[str], max_workers: int = 8) -> Tuple[List[List[Document]], List[str]]:
+    """Retrieve context for many queries, embedding them in a single pass when the retriever allows it.
+
+    Returns the documents and a per-query error message ("" on success), so one
+    failed request to the retrieval service doesn't abort the whole batch.
+    """
+    if not hasattr(retriever, "search_vectors"):
+        def retrieve(query: str) -> Tuple[List[Document], str]:
+            try:
+                return retriever.invoke(query), ""
+            except Exception as e:
+                return [], f"Retrieval failed: {e}"
+
+        # Remote retriever: concurrent requests are coalesced by the retrieval service
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(retrieve, queries))
+        return [documents for documents, _ in results], [error for _, error in results]
+
+    vectors = retriever.embed_queries(queries)
+    groups = defaultdict(list)
+    for i, query in enumerate(queries):
+        groups[resolve_namespace(query, retriever.vendor, retriever.technology)].append(i)
+    results: List[List[Document]] = [[] for _ in queries]
+    for (vendor, technology), rows in groups.items():
+        for row, documents in zip(rows, retriever.search_vectors(vectors[rows], retriever.k, vendor, technology)):
+            results[row] = documents
+    return results, [""] * len(queries)
+
+def cluster_records(records: List[Dict[str, str]], retriever: BaseRetriever, threshold: float = 0.92) -> List[List[int]]:
+    """Group near-duplicate alarms, using the retriever's embedder when it is local."""
+    embed = retriever.embed_queries if hasattr(retriever, "embed_queries") else None
+    return cluster_alarm_texts([alarm_text(record) for record in records], embed, threshold)
+
+def triage_alarms(
+    records: List[Dict[str, str]],
+    retriever: BaseRetriever,
+    answer_chain: Any,
+    max_concurrency: int = 4,
+    clusters: Optional[List[List[int]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Answer every alarm with the alarm prompt, yielding structured results as each one completes.
+
+    With ``clusters``, only the first alarm of each cluster is retrieved and
+    answered; the answer is fanned out to the other members with their own
+    site, cell and timestamp identifiers filled in.
+    """
+    queries = [alarm_text(record) for record in records]
+    if clusters is None:
+        clusters = [[row] for row in range(len(records))]
+    contexts, retrieval_errors = retrieve_batch(retriever, [queries[members[0]] for members in clusters])
+
+    def answer(cluster_id: int) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        members = clusters[cluster_id]
+        sources = "; ".join(sorted({
+            f"{doc.metadata.get('source', '')} p.{doc.metadata.get('page', '')}" for doc in contexts[cluster_id]
+        }))
+        text, error = "", retrieval_errors[cluster_id]
+        if not error:
+            try:
+                text = answer_chain.invoke({"input": queries[members[0]], "chat_history": "", "context": contexts[cluster_id]})
+            except Exception as e:
+                error = str(e)
+        latency = round(time.perf_counter() - start, 2)
+
+        representative_ids = mask_identifiers(queries[members[0]])[1]
+        results = []
+        for row in members:
+            member_text = fill_identifiers(text, representative_ids, mask_identifiers(queries[row])[1]) if text else ""
+            result = {field: records[row].get(field, "") for field in ALARM_DETAIL_FIELDS}
+            result.update({
+                "row": row,
+                "alarm_text": queries[row],
+                "cluster": cluster_id,
+                "cluster_size": len(members),
+                "answer": member_text,
+                "sources": sources,
+                "error": error,
+                "latency": latency
+            })
+            result.update(parse_structured_answer(member_text) if member_text else dict.fromkeys(ANSWER_SECTIONS, ""))
+            results.append(result)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        futures = [pool.submit(answer, cluster_id) for cluster_id in range(len(clusters))]
+        for future in as_completed(futures):
+            yield from future.result()
+
+class TriageWriter:
+    """Append triage results to a JSONL or CSV stream as they arrive."""
+
+    def __init__(self, stream: Any, output_format: str = "jsonl"):
+        self.stream = stream
+        self.output_format = output_format
+        self._csv: Optional[csv.DictWriter] = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if self._csv:
+            self._csv.writerow(result)
+        else:
+            self.stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.stream.flush()
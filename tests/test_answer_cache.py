@@ -0,0 +1,101 @@
+import re
+from typing import Any, List, Optional
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.retrievers import BaseRetriever
+from models.answer_cache import AnswerCache, CanonicalAnswerChain, create_canonical_rag_chain
+from models.simulated_llm import SimulatedLatencyChatModel
+from ui.chat import generate_response
+
+class StaticRetriever(BaseRetriever):
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return [Document(page_content="Check the fan unit.", metadata={"chunk_id": 1})]
+
+def make_chain(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"))
+    llm = SimulatedLatencyChatModel(mean_latency=0.0, answer="1. Response: Inspect ENB_1234.")
+    return CanonicalAnswerChain(llm, StaticRetriever(), "English", "alarm", cache), cache
+
+def test_identifiers_are_filled_back_on_reuse(tmp_path):
+    chain, cache = make_chain(tmp_path)
+    chain.invoke({"input": "Fan failure on ENB_1234", "chat_history": ""})
+    result = chain.invoke({"input": "Fan failure on ENB_5678", "chat_history": ""})
+    assert cache.stats()["canonical_hits"] == 1
+    assert result["answer"] == "1. Response: Inspect ENB_5678."
+
+def test_numbers_are_part_of_the_key(tmp_path):
+    chain, cache = make_chain(tmp_path)
+    chain.invoke({"input": "Temperature 85 C on ENB_1234", "chat_history": ""})
+    chain.invoke({"input": "Temperature 20 C on ENB_1234", "chat_history": ""})
+    assert cache.stats()["canonical_hits"] == 0
+
+def test_answers_are_not_shared_across_histories(tmp_path):
+    chain, cache = make_chain(tmp_path)
+    question = "Summarize the recommended steps again"
+    chain.invoke({"input": question, "chat_history": "user: Fan failure on ENB_1234"})
+    chain.invoke({"input": question, "chat_history": "user: VSWR alarm on ENB_5678"})
+    assert cache.stats()["canonical_hits"] == 0
+    chain.invoke({"input": question, "chat_history": "user: VSWR alarm on ENB_5678"})
+    assert cache.stats()["canonical_hits"] == 1
+
+class TranslatingChatModel(BaseChatModel):
+    """Translates "Lüfterausfall an" to English and answers alarms by naming the site in the question."""
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "translating-fake"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self.calls += 1
+        prompt = messages[-1].content
+        if "Translate the following" in prompt:
+            text = prompt.split("Text:", 1)[1].strip()
+            if "into English" in prompt:
+                content = text.replace("Lüfterausfall an", "Fan failure on")
+            else:
+                content = "[de] " + text
+        else:
+            question = prompt.split("Current question:", 1)[1].splitlines()[0]
+            site = re.search(r"RBS\d+", question).group()
+            content = f"1. Response: Inspect {site}."
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+def conversation(*turns):
+    messages = [{"role": "assistant", "content": "Hello! How can I help?"}]
+    for turn in turns:
+        messages.append({"role": "user", "content": turn})
+    return messages
+
+def ask(chains, language, messages):
+    response = generate_response(chains[language], messages[-1]["content"], messages, lambda prompt: True)
+    messages.append({"role": "assistant", "content": response["answer"]})
+    return response["answer"]
+
+def test_reuse_across_sites_and_languages_through_generate_response(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"))
+    llm = TranslatingChatModel()
+    chains = {
+        language: create_canonical_rag_chain(llm, StaticRetriever(), language, cache)
+        for language in ("English", "German")
+    }
+    first = conversation("Fan failure on RBS0001")
+    assert ask(chains, "English", first) == "1. Response: Inspect RBS0001."
+    assert llm.calls == 1
+
+    # Later standalone turn in the same conversation, and a new English conversation
+    first.append({"role": "user", "content": "Fan failure on RBS0002"})
+    assert ask(chains, "English", first) == "1. Response: Inspect RBS0002."
+    assert ask(chains, "English", conversation("Fan failure on RBS0005")) == "1. Response: Inspect RBS0005."
+    assert llm.calls == 1
+
+    # German: translate the question and the canonical answer, but no new generation
+    assert ask(chains, "German", conversation("Lüfterausfall an RBS0003")) == "[de] 1. Response: Inspect RBS0003."
+    assert llm.calls == 3
+    # Same alarm on another site: both translations come from the cache
+    assert ask(chains, "German", conversation("Lüfterausfall an RBS0004")) == "[de] 1. Response: Inspect RBS0004."
+    assert llm.calls == 3
+    assert cache.stats()["canonical_hits"] == 4
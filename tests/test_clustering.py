@@ -0,0 +1,31 @@
+import numpy as np
+from models.clustering import cluster_alarm_texts, fill_identifiers, mask_identifiers
+
+def same_vector(texts):
+    """Embedding that rates every pair of templates as identical."""
+    return np.ones((len(texts), 4))
+
+def test_site_prefix_keeps_node_types_apart():
+    texts = ["Cell down on ENB_1234", "Cell down on GNB_5678", "Cell down on ENB_99"]
+    assert mask_identifiers(texts[0])[0] == "cell down on <site:enb>"
+    assert cluster_alarm_texts(texts) == [[0, 2], [1]]
+    assert cluster_alarm_texts(texts, same_vector) == [[0, 2], [1]]
+
+def test_numbers_are_not_masked_or_merged():
+    texts = ["Board 3 faulty", "Board 30 faulty"]
+    assert mask_identifiers(texts[0]) == ("board 3 faulty", [])
+    assert cluster_alarm_texts(texts, same_vector) == [[0], [1]]
+
+def test_fill_identifiers_keeps_step_numbers():
+    _, source = mask_identifiers("RF alarm on ENB_1234 cell LTE_C11")
+    _, target = mask_identifiers("RF alarm on ENB_77 cell LTE_C42")
+    assert fill_identifiers("1. Check ENB_1234 LTE_C11", source, target) == "1. Check ENB_77 LTE_C42"
+
+def test_ip_addresses_are_not_taken_for_dotted_dates():
+    assert mask_identifiers("Link down to 10.10.10.10") == ("link down to <ip>", [("IP", "10.10.10.10")])
+    assert mask_identifiers("Link down to 10.20.30.40 since 01.02.2024")[0] == "link down to <ip> since <timestamp>"
+    texts = ["Link down to 10.10.10.10", "Link down to 10.20.30.40"]
+    assert cluster_alarm_texts(texts) == [[0, 1]]
+    _, source = mask_identifiers(texts[0])
+    _, target = mask_identifiers(texts[1])
+    assert fill_identifiers("Ping 10.10.10.10 from the router", source, target) == "Ping 10.20.30.40 from the router"
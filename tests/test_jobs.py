@@ -0,0 +1,75 @@
+import time
+import sqlite3
+import evaluation.jobs as jobs
+from evaluation.jobs import EvaluationQueue
+
+class RecordingEvaluator:
+    def __init__(self, name, ran):
+        self.name = name
+        self.ran = ran
+
+    def evaluate_rag(self, question, answer, contexts, ground_truth=None, errors=None):
+        self.ran.append((self.name, question))
+        errors.append("Failed to parse relevance score: high")
+        return {"relevance": 0.5, "average_score": 0.5}
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def test_reclaimed_jobs_run_only_with_their_sessions_evaluator(tmp_path):
+    db = str(tmp_path / "evaluations.sqlite3")
+    ran = []
+    queue = EvaluationQueue(db)
+    job_id = queue.submit(RecordingEvaluator("a", ran), "q", "answer", ["c"], "")
+    assert wait_for(lambda: queue.get_job(job_id)["status"] == "done")
+    assert queue.get_job(job_id)["error"] == "Failed to parse relevance score: high"
+
+    # Simulate the job being left running by a process that died
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "UPDATE evaluation_jobs SET status = 'running', owner = 'dead', lease_expires_at = ? WHERE id = ?",
+            (time.time() - 1, job_id)
+        )
+    restarted = EvaluationQueue(db)
+    assert restarted.get_job(job_id)["status"] == "queued"
+    assert restarted.resume_pending(RecordingEvaluator("b", ran), ["other-session-job"]) == 0
+    assert restarted.needs_resume([job_id])
+    assert restarted.resume_pending(RecordingEvaluator("a", ran), [job_id]) == 1
+    assert wait_for(lambda: restarted.get_job(job_id)["status"] == "done")
+    assert ran == [("a", "q"), ("a", "q")]
+
+class LockingEvaluator:
+    """Makes the next database connection fail, i.e. the write of its own result."""
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    def evaluate_rag(self, question, answer, contexts, ground_truth=None, errors=None):
+        self.failures.append(1)
+        return {"average_score": 1.0}
+
+def test_failed_result_write_lets_the_lease_expire(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "LEASE_SECONDS", 0.4)
+    monkeypatch.setattr(jobs, "FINISH_ATTEMPTS", 1)
+    queue = EvaluationQueue(str(tmp_path / "evaluations.sqlite3"))
+    failures = []
+    connect = queue._connect
+
+    def flaky_connect():
+        if failures:
+            failures.pop()
+            raise sqlite3.OperationalError("database is locked")
+        return connect()
+
+    monkeypatch.setattr(queue, "_connect", flaky_connect)
+    job_id = queue.submit(LockingEvaluator(failures), "q", "answer", ["c"], "")
+    assert wait_for(lambda: queue.get_job(job_id)["status"] == "running" and not failures)
+    # The lease is no longer renewed, so the heartbeat puts the job back in the queue
+    assert wait_for(lambda: queue.get_job(job_id)["status"] == "queued")
+    assert queue.get_job(job_id)["owner"] is None
+    assert queue.needs_resume([job_id])
@@ -0,0 +1,32 @@
+from models.namespaces import GENERIC, infer_namespace, select_shards, shard_key, tag_document
+
+NOKIA_PAGE = "7116 - NO CONNECTION TO UNIT is a Nokia alarm. " * 3 + "It is typically resolved using a remote reset."
+
+def test_path_tag_applies_to_every_chunk():
+    tags = tag_document("pdf files/huawei/lte_alarms.pdf", "7116 is a Nokia alarm.")
+    assert tags == {"vendor": "Huawei", "technology": "4G", "doc_type": "alarm"}
+
+def test_chunks_are_tagged_from_their_own_content():
+    chunk = "20016 - RF Resource Unavailable is a Huawei alarm."
+    assert tag_document("pdf files/Final_NOC_POC_English_V1.pdf", chunk, NOKIA_PAGE)["vendor"] == "Huawei"
+
+def test_untagged_chunk_falls_back_to_page_then_generic():
+    chunk = "It is typically resolved using a remote reset."
+    assert tag_document("pdf files/noc.pdf", chunk, NOKIA_PAGE)["vendor"] == "Nokia"
+    assert tag_document("pdf files/noc.pdf", chunk, "One Nokia alarm.")["vendor"] == GENERIC
+
+def test_chunk_naming_several_vendors_uses_the_page():
+    chunk = "Unlike Nokia, this Huawei alarm needs a site visit."
+    assert tag_document("pdf files/noc.pdf", chunk, NOKIA_PAGE)["vendor"] == "Nokia"
+
+def test_ambiguous_words_do_not_narrow_questions():
+    assert infer_namespace("Cell edge throughput dropped on site RBS0012") == (None, None)
+    assert infer_namespace("nr of alarms on ENB_1234") == (None, None)
+    assert infer_namespace("Nokia LTE S1 link down") == ("Nokia", "4G")
+    assert infer_namespace("Huawei or Nokia GSM cell down") == (None, "2G")
+
+def test_select_shards_always_includes_generic():
+    keys = [shard_key("Nokia", "4G"), shard_key("Huawei", "4G"), shard_key("Nokia", GENERIC), shard_key(GENERIC, GENERIC)]
+    assert select_shards(keys, "Nokia", "4G") == ["Nokia__4G", "Nokia__generic", "generic__generic"]
+    assert select_shards(keys, "Huawei", None) == ["Huawei__4G", "generic__generic"]
+    assert select_shards(keys, None, None) == keys
@@ -0,0 +1,60 @@
+from langchain_core.documents import Document
+from models.triage import parse_structured_answer, triage_alarms
+
+NESTED_ANSWER = """1. Response: The RF unit lost its CPRI link.
+2. Explanation of the issue: A fibre or SFP fault between the baseband and radio.
+3. Recommended steps/actions:
+1. Check: SFP optical power on both ends.
+2. Reseat the fibre.
+   1. Clean connectors: use a fibre cleaner.
+4. Quality steps to follow: Raise a ticket and update the site log."""
+
+BOLD_ANSWER = """**1. Response:** Replace the faulty fan unit.
+
+**2. Explanation of the issue:** The fan speed is below threshold.
+
+**3. Recommended steps/actions:**
+1. Verify: fan alarm history.
+2. Swap the fan tray.
+
+**4. Quality steps to follow:**
+* Attach photos to the ticket."""
+
+def test_nested_list_stays_in_recommended_steps():
+    sections = parse_structured_answer(NESTED_ANSWER)
+    assert sections["response"] == "The RF unit lost its CPRI link."
+    assert sections["explanation"].startswith("A fibre or SFP fault")
+    assert "1. Check: SFP optical power" in sections["recommended_steps"]
+    assert "Clean connectors" in sections["recommended_steps"]
+    assert sections["quality_steps"] == "Raise a ticket and update the site log."
+
+def test_bold_headings_ignore_plain_numbered_lines():
+    sections = parse_structured_answer(BOLD_ANSWER)
+    assert sections["response"] == "Replace the faulty fan unit."
+    assert sections["recommended_steps"].startswith("1. Verify: fan alarm history.")
+    assert sections["quality_steps"] == "Attach photos to the ticket."
+
+def test_unstructured_answer_goes_to_response():
+    sections = parse_structured_answer("Check the power supply.")
+    assert sections["response"] == "Check the power supply."
+    assert sections["recommended_steps"] == ""
+
+class FailingRemoteRetriever:
+    """Stands in for RemoteRetriever: no search_vectors, fails for one alarm."""
+
+    def invoke(self, query):
+        if "Fan" in query:
+            raise ConnectionError("retrieval service unavailable")
+        return [Document(page_content="context", metadata={"source": "guide.pdf", "page": 1})]
+
+class EchoChain:
+    def invoke(self, inputs):
+        return "1. Response: ok"
+
+def test_remote_retrieval_error_is_reported_per_alarm():
+    records = [{"alarm_name": "Fan Failure"}, {"alarm_name": "Link Down"}]
+    results = {result["row"]: result for result in triage_alarms(records, FailingRemoteRetriever(), EchoChain())}
+    assert "retrieval service unavailable" in results[0]["error"]
+    assert results[0]["answer"] == ""
+    assert results[1]["error"] == ""
+    assert results[1]["response"] == "ok"
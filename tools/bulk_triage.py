@@ -0,0 +1,83 @@
+"""Triage an OSS alarm export (CSV or JSON) in one run.
+
+Usage:
+    python -m tools.bulk_triage alarms.csv --output triage.jsonl --max-concurrency 8
+    python -m tools.bulk_triage alarms.json --format csv --output triage.csv --llm stub
+
+Near-duplicate alarms (same text apart from site, cell, IP address or
+timestamp) are clustered first and answered once per cluster. Cluster
+representatives are embedded and searched in one batch, then the alarm
+prompt is sent per cluster with bounded parallelism. Each result is
+appended to the output file as soon as it completes.
+"""
+import os
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+from config.settings import load_configuration
+from data.language import SUPPORTED_LANGUAGES
+from models.namespaces import AUTO, ALL, VENDOR_KEYWORDS, TECHNOLOGY_KEYWORDS
+from models.rag import load_rag_components, create_answer_chains, scope_retriever
+from models.retrieval_service import RemoteRetriever
+from models.simulated_llm import SimulatedLatencyChatModel
+from models.clustering import clustering_summary
+from models.triage import load_alarm_export, cluster_records, triage_alarms, TriageWriter
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk alarm triage for RAN Ops Assist")
+    parser.add_argument("input", help="CSV or JSON alarm export")
+    parser.add_argument("--output", default="triage_results.jsonl")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--language", choices=list(SUPPORTED_LANGUAGES.keys()), default="English")
+    parser.add_argument("--vendor", choices=[AUTO, ALL] + list(VENDOR_KEYWORDS.keys()), default=AUTO)
+    parser.add_argument("--technology", choices=[AUTO, ALL] + list(TECHNOLOGY_KEYWORDS.keys()), default=AUTO)
+    parser.add_argument("--max-concurrency", type=int, default=4, help="Parallel LLM requests")
+    parser.add_argument("--llm", choices=["gemini", "stub"], default="gemini")
+    parser.add_argument("--no-cluster", action="store_true", help="Answer every alarm separately")
+    parser.add_argument("--similarity-threshold", type=float, default=0.92, help="Cosine similarity for merging alarm templates")
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = load_configuration()
+    with open(args.input, "rb") as f:
+        records = load_alarm_export(f.read(), args.input)
+    if not records:
+        sys.exit(f"No alarms found in {args.input}")
+
+    if args.llm == "stub":
+        llm = SimulatedLatencyChatModel()
+    else:
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            sys.exit("Set GOOGLE_API_KEY to triage with Gemini")
+        llm = config['model_setup'](api_key)
+
+    if config['retrieval_service']:
+        retriever = RemoteRetriever(address=config['retrieval_service'], k=config['retrieval_k'])
+    else:
+        retriever, _ = load_rag_components(config)
+    retriever = scope_retriever(retriever, args.vendor, args.technology)
+    answer_chain = create_answer_chains(llm, args.language)['alarm']
+
+    start = time.perf_counter()
+    clusters = None if args.no_cluster else cluster_records(records, retriever, args.similarity_threshold)
+    if clusters is not None:
+        summary = clustering_summary(clusters)
+        print(
+            f"{summary['alarms']} alarms in {summary['clusters']} clusters "
+            f"({summary['duplicate_clusters']} with duplicates, largest {summary['largest_cluster']}): "
+            f"{summary['llm_calls']} LLM calls, {summary['llm_calls_saved']} saved"
+        )
+    errors = 0
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        writer = TriageWriter(f, args.format)
+        results = triage_alarms(records, retriever, answer_chain, args.max_concurrency, clusters)
+        for done, result in enumerate(results, start=1):
+            writer.write(result)
+            errors += bool(result["error"])
+            print(f"[{done}/{len(records)}] row {result['row']}: {'ERROR ' + result['error'] if result['error'] else 'ok'} ({result['latency']}s)")
+    print(f"Triaged {len(records)} alarms in {time.perf_counter() - start:.1f}s with {errors} errors -> {args.output}")
+
+if __name__ == "__main__":
+    main()
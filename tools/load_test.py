@@ -0,0 +1,332 @@
+"""Replay recorded or synthetic NOC chat sessions against the RAG chains.
+
+Usage:
+    python -m tools.load_test --llm stub --concurrency 1,2,4,8,16 --sessions 40
+    python -m tools.load_test --llm gemini --sessions-file sessions.json --rate 0.5
+
+Each turn goes through ``ui.chat.generate_response``, the same path as the
+chat UI. Retrieval uses the local index, or the shared retrieval service
+when RETRIEVAL_SERVICE is set. A sessions file is a JSON list of
+``{"language": "German", "turns": ["...", "..."]}`` objects.
+
+Latency is reported per stage. With ``--rate``, ``wait`` is the time an
+arrived session queued for a free worker, and ``response`` (wait plus
+total) is what degradation is judged on.
+
+With ``--canonical`` every concurrency level starts from its own empty
+answer cache in a temporary directory, so levels are comparable and stub
+answers never reach the application's cache database.
+"""
+import os
+import json
+import math
+import time
+import random
+import argparse
+import tempfile
+import threading
+from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from config.settings import load_configuration
+from data.language import SUPPORTED_LANGUAGES
+from models.rag import load_rag_components, create_rag_chain
+from models.answer_cache import AnswerCache, create_canonical_rag_chain
+from models.retrieval_service import RemoteRetriever
+from models.simulated_llm import SimulatedLatencyChatModel
+from ui.chat import generate_response
+from utils.helpers import is_alarm_related_question
+
+# "wait" is time queued for a worker after an open-loop arrival; "response" adds it to "total"
+STAGES = ("wait", "retrieval", "generation", "total", "response")
+
+# Synthetic turns per language: alarm questions first, then general follow-ups
+SAMPLE_TURNS: Dict[str, Dict[str, List[str]]] = {
+    "English": {
+        "alarm": [
+            "RF Unit Maintenance Link Failure alarm on site {site}, what should I do?",
+            "Cell {site} is down with a Service Unavailable alarm",
+            "SFP missing alarm raised on baseband unit at {site}",
+            "Network connection failure between {site} and the core, how to troubleshoot?"
+        ],
+        "general": [
+            "What did I ask previously?",
+            "Which quality points apply when creating an INC?",
+            "Summarize the recommended steps again"
+        ]
+    },
+    "Romanian": {
+        "alarm": [
+            "Alarmă RF Unit Maintenance Link Failure pe site-ul {site}, ce trebuie să fac?",
+            "Celula {site} este down cu alarmă Service Unavailable",
+            "Alarmă SFP missing pe unitatea baseband la {site}"
+        ],
+        "general": [
+            "Ce am întrebat anterior?",
+            "Ce puncte de calitate se aplică la crearea unui INC?"
+        ]
+    },
+    "German": {
+        "alarm": [
+            "RF Unit Maintenance Link Failure Alarm am Standort {site}, was soll ich tun?",
+            "Zelle {site} ist down mit Service Unavailable Alarm",
+            "SFP missing Alarm an der Baseband-Einheit bei {site}"
+        ],
+        "general": [
+            "Was habe ich vorher gefragt?",
+            "Welche Qualitätspunkte gelten beim Erstellen eines INC?"
+        ]
+    }
+}
+
+class StageTimer(BaseCallbackHandler):
+    """Record retrieval and LLM wall-clock time for a single chain invocation."""
+
+    def __init__(self):
+        self.started: Dict[UUID, float] = {}
+        self.durations: Dict[str, float] = {"retrieval": 0.0, "generation": 0.0}
+
+    def _start(self, run_id: UUID) -> None:
+        self.started[run_id] = time.perf_counter()
+
+    def _end(self, run_id: UUID, stage: str) -> None:
+        if run_id in self.started:
+            self.durations[stage] += time.perf_counter() - self.started.pop(run_id)
+
+    def on_retriever_start(self, serialized: Dict[str, Any], query: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_retriever_end(self, documents: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "retrieval")
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "generation")
+
+def synthetic_sessions(count: int, turns: int, seed: int) -> List[Dict[str, Any]]:
+    """Build multi-turn sessions mixing alarm and general questions in every language."""
+    rng = random.Random(seed)
+    languages = list(SUPPORTED_LANGUAGES.keys())
+    sessions = []
+    for i in range(count):
+        language = languages[i % len(languages)]
+        pool = SAMPLE_TURNS[language]
+        site = f"RBS{rng.randint(1, 9999):04d}"
+        session_turns = [rng.choice(pool["alarm"]).format(site=site)]
+        for _ in range(turns - 1):
+            kind = "general" if rng.random() < 0.4 else "alarm"
+            session_turns.append(rng.choice(pool[kind]).format(site=site))
+        sessions.append({"language": language, "turns": session_turns})
+    return sessions
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def validate_sessions(sessions: Any) -> None:
+    """Reject recorded sessions the replay cannot run, before any load is generated."""
+    if not isinstance(sessions, list):
+        raise SystemExit("Sessions file must contain a JSON list of sessions")
+    for i, session in enumerate(sessions):
+        if not isinstance(session, dict) or session.get("language") not in SUPPORTED_LANGUAGES:
+            raise SystemExit(f"Session {i}: language must be one of {', '.join(SUPPORTED_LANGUAGES)}")
+        turns = session.get("turns")
+        if not isinstance(turns, list) or not turns or not all(isinstance(turn, str) for turn in turns):
+            raise SystemExit(f"Session {i}: turns must be a non-empty list of strings")
+
+def run_session(
+    session: Dict[str, Any],
+    chains: Dict[str, Dict[str, Any]],
+    think_time: float,
+    arrived: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Replay one session turn by turn, keeping chat history like the UI does.
+
+    ``arrived`` is when the session arrived in open-loop mode; the time it
+    spent queued for a worker is charged to its first turn.
+    """
+    language = session["language"]
+    messages = [{"role": "assistant", "content": SUPPORTED_LANGUAGES[language]["welcome"]}]
+    records = []
+    wait = time.perf_counter() - arrived if arrived is not None else 0.0
+    for prompt in session["turns"]:
+        messages.append({"role": "user", "content": prompt})
+        timer = StageTimer()
+        start = time.perf_counter()
+        record = {"language": language, "error": None, "wait": wait}
+        wait = 0.0
+        try:
+            response = generate_response(chains[language], prompt, messages, is_alarm_related_question, callbacks=[timer])
+            messages.append({"role": "assistant", "content": response["answer"]})
+            record["chain_type"] = response["chain_type"]
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["total"] = time.perf_counter() - start
+        record["response"] = record["wait"] + record["total"]
+        record.update(timer.durations)
+        records.append(record)
+        if think_time:
+            time.sleep(random.expovariate(1 / think_time))
+    return records
+
+def run_level(
+    sessions: List[Dict[str, Any]],
+    chains: Dict[str, Dict[str, Any]],
+    concurrency: int,
+    rate: float,
+    think_time: float
+) -> Dict[str, Any]:
+    """Run all sessions at one concurrency level and summarise the results."""
+    records: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def worker(session: Dict[str, Any], arrived: Optional[float]) -> None:
+        result = run_session(session, chains, think_time, arrived)
+        with lock:
+            records.extend(result)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = []
+        for session in sessions:
+            # Open-loop Poisson arrivals when a rate is given, otherwise saturate the pool
+            futures.append(pool.submit(worker, session, time.perf_counter() if rate > 0 else None))
+            if rate > 0:
+                time.sleep(random.expovariate(rate))
+        # Surface failures outside the per-turn handling instead of silently dropping sessions
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in records if not r["error"]]
+    summary = {
+        "concurrency": concurrency,
+        "turns": len(records),
+        "errors": len(records) - len(ok),
+        "error_rate": (len(records) - len(ok)) / len(records) if records else 0.0,
+        "throughput": len(ok) / elapsed if elapsed else 0.0,
+        "elapsed": elapsed,
+        "sample_errors": sorted({r["error"] for r in records if r["error"]})[:3]
+    }
+    for stage in STAGES:
+        values = [r[stage] for r in ok]
+        summary[stage] = {f"p{p}": percentile(values, p) for p in (50, 95, 99)}
+    return summary
+
+def find_degradation(levels: List[Dict[str, Any]], factor: float, max_error_rate: float) -> Optional[int]:
+    """Return the first concurrency whose p95 response time or error rate degrades past the thresholds."""
+    if not levels:
+        return None
+    baseline = levels[0]["response"]["p95"]
+    for level in levels:
+        if level["error_rate"] > max_error_rate or (baseline and level["response"]["p95"] > factor * baseline):
+            return level["concurrency"]
+    return None
+
+def build_llm(args: argparse.Namespace, config: Dict[str, Any]) -> Any:
+    if args.llm == "stub":
+        return SimulatedLatencyChatModel(mean_latency=args.stub_latency, error_rate=args.stub_error_rate)
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise SystemExit("Set GOOGLE_API_KEY to load test against Gemini")
+    return config['model_setup'](api_key)
+
+def build_chains(llm: Any, retriever: Any, answer_cache: Optional[AnswerCache]) -> Dict[str, Dict[str, Any]]:
+    if answer_cache is None:
+        return {language: create_rag_chain(llm, retriever, language) for language in SUPPORTED_LANGUAGES}
+    return {
+        language: create_canonical_rag_chain(llm, retriever, language, answer_cache)
+        for language in SUPPORTED_LANGUAGES
+    }
+
+def print_report(levels: List[Dict[str, Any]], degradation: Optional[int]) -> None:
+    header = f"{'conc':>5} {'turns':>6} {'err%':>6} {'turns/s':>8}"
+    for stage in STAGES:
+        header += f" {stage + ' p50/p95/p99 (s)':>30}"
+    print(header)
+    for level in levels:
+        row = f"{level['concurrency']:>5} {level['turns']:>6} {level['error_rate'] * 100:>5.1f}% {level['throughput']:>8.2f}"
+        for stage in STAGES:
+            s = level[stage]
+            row += f" {s['p50']:>9.2f} {s['p95']:>9.2f} {s['p99']:>9.2f}"
+        print(row)
+        for error in level["sample_errors"]:
+            print(f"      error: {error}")
+        if "answer_cache" in level:
+            stats = level["answer_cache"]
+            print(
+                f"      canonical answers: {stats['canonical_hit_rate']:.0%} hit rate, {stats['llm_calls']} LLM calls, "
+                f"{stats['tokens_saved']:,.0f} tokens and {stats['latency_saved']:.1f}s saved vs per-language generation"
+            )
+    if degradation is None:
+        print("No degradation detected within the tested concurrency levels.")
+    else:
+        print(f"Latency/error degradation starts at concurrency {degradation}.")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the RAN Ops Assist RAG chains")
+    parser.add_argument("--llm", choices=["stub", "gemini"], default="stub")
+    parser.add_argument("--stub-latency", type=float, default=1.5, help="Mean simulated LLM latency in seconds")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--sessions-file", help="JSON file with recorded sessions")
+    parser.add_argument("--sessions", type=int, default=30, help="Synthetic sessions per concurrency level")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per synthetic session")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated concurrency levels to ramp through")
+    parser.add_argument("--rate", type=float, default=0.0, help="Session arrival rate per second (0 = closed loop)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds between turns in a session")
+    parser.add_argument("--degrade-factor", type=float, default=2.0, help="p95 growth over the first level counted as degradation")
+    parser.add_argument("--max-error-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--canonical", action="store_true",
+        help="Reuse canonical English answers across languages, with a fresh temporary cache per level"
+    )
+    parser.add_argument("--output", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    load_dotenv()
+    random.seed(args.seed)
+    config = load_configuration()
+    if config['retrieval_service']:
+        retriever = RemoteRetriever(address=config['retrieval_service'], k=config['retrieval_k'])
+    else:
+        retriever, _ = load_rag_components(config)
+    llm = build_llm(args, config)
+
+    if args.sessions_file:
+        with open(args.sessions_file, encoding="utf-8") as f:
+            sessions = json.load(f)
+        validate_sessions(sessions)
+    else:
+        sessions = synthetic_sessions(args.sessions, args.turns, args.seed)
+
+    levels = []
+    with tempfile.TemporaryDirectory(prefix="load_test_cache_") as cache_dir:
+        for i, concurrency in enumerate(int(c) for c in args.concurrency.split(",")):
+            answer_cache = AnswerCache(os.path.join(cache_dir, f"level{i}.sqlite3")) if args.canonical else None
+            chains = build_chains(llm, retriever, answer_cache)
+            print(f"Running {len(sessions)} sessions at concurrency {concurrency}...")
+            level = run_level(sessions, chains, concurrency, args.rate, args.think_time)
+            if answer_cache is not None:
+                level["answer_cache"] = answer_cache.stats()
+            levels.append(level)
+
+    degradation = find_degradation(levels, args.degrade_factor, args.max_error_rate)
+    print_report(levels, degradation)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"levels": levels, "degradation_concurrency": degradation}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
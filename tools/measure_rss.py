@@ -0,0 +1,177 @@
+"""Compare process memory of in-memory Document lists against the ChunkStore.
+
+Usage:
+    python -m tools.measure_rss --chunks 200000
+    python -m tools.measure_rss --pdf-dir "pdf files" --copies 50
+
+Without ``--pdf-dir`` a synthetic corpus compares only the chunk text and
+metadata layouts. With ``--pdf-dir`` the real ingestion paths are measured:
+the original ``PyPDFDirectoryLoader`` + ``FAISS.from_documents`` setup that
+kept the split Document list, against ``load_rag_components`` opening a
+prebuilt chunk store. ``--copies`` links every PDF several times to simulate
+a larger corpus. ``--embedding fake`` swaps MiniLM for a deterministic
+384-dimensional embedding when the model cannot be downloaded; the model
+weights are identical on both paths, so the difference is unaffected.
+
+Stores are built in a separate subprocess first, so each measured process
+holds only what a serving Streamlit worker would hold, and every mode runs
+in its own subprocess so the numbers do not contaminate each other.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from typing import Any, Dict, List
+
+CHUNK_TEXT = "Cell {i} on site RBS{site:05d} reports RF Unit Maintenance alarm; check VSWR and fibre links. " * 3
+
+def read_rss() -> Dict[str, int]:
+    """Return RSS figures in kB from /proc/self/status."""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "VmHWM", "RssAnon", "RssFile"):
+                values[key] = int(rest.split()[0])
+    return values
+
+def report(**extra: int) -> None:
+    print(json.dumps({**extra, **read_rss()}))
+
+def synthetic_documents(chunks: int, _: str) -> None:
+    """Legacy layout: a Document list plus the FAISS docstore copy."""
+    from langchain_core.documents import Document
+    docs = [
+        Document(
+            page_content=CHUNK_TEXT.format(i=i, site=i % 5000),
+            metadata={"source": f"pdf files/doc_{i % 40}.pdf", "page": i % 300}
+        )
+        for i in range(chunks)
+    ]
+    docstore = {
+        str(i): Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+        for i, doc in enumerate(docs)
+    }
+    report(chunks=len(docstore))
+
+def synthetic_build(chunks: int, path: str) -> None:
+    from models.chunk_store import ChunkStoreWriter
+    writer = ChunkStoreWriter(path)
+    for i in range(chunks):
+        writer.add(CHUNK_TEXT.format(i=i, site=i % 5000), f"pdf files/doc_{i % 40}.pdf", i % 300)
+    writer.close()
+
+def synthetic_chunk_store(chunks: int, path: str) -> None:
+    """Compact layout: open a prebuilt store and touch every chunk, as after a warm-up."""
+    from models.chunk_store import ChunkStore
+    store = ChunkStore(path)
+    total = sum(len(store.text(i)) for i in range(len(store)))
+    report(chunks=len(store), text_chars=total)
+
+def _config(pdf_dir: str, store_dir: str) -> Dict:
+    from config.settings import load_configuration
+    return {**load_configuration(), 'pdf_dir': pdf_dir, 'chunk_store_dir': store_dir}
+
+def _embedding(config: Dict) -> Any:
+    if os.environ.get("MEASURE_RSS_EMBEDDING") == "fake":
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        return DeterministicFakeEmbedding(size=384)
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=config['embedding_model'])
+
+def real_legacy(pdf_dir: str, _: str) -> None:
+    """The original setup_rag_components body: Document list plus FAISS docstore."""
+    from langchain_community.document_loaders import PyPDFDirectoryLoader
+    from langchain_community.vectorstores import FAISS
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    config = _config(pdf_dir, "")
+    embedding = _embedding(config)
+    extracted_docs = PyPDFDirectoryLoader(pdf_dir).load()
+    docs = RecursiveCharacterTextSplitter(
+        chunk_size=config['chunk_size'], chunk_overlap=config['chunk_overlap']
+    ).split_documents(extracted_docs)
+    vector_store = FAISS.from_documents(documents=docs, embedding=embedding)
+    vector_store.as_retriever().invoke("RF Unit Maintenance Link Failure")
+    report(chunks=len(docs))
+
+def real_build(pdf_dir: str, store_dir: str) -> None:
+    from models.rag import load_rag_components
+    config = _config(pdf_dir, store_dir)
+    load_rag_components(config, _embedding(config))
+    report()
+
+def real_current(pdf_dir: str, store_dir: str) -> None:
+    """A worker opening the prebuilt chunk store through load_rag_components."""
+    from models.rag import load_rag_components
+    config = _config(pdf_dir, store_dir)
+    retriever, store = load_rag_components(config, _embedding(config))
+    retriever.invoke("RF Unit Maintenance Link Failure")
+    total = sum(len(store.text(i)) for i in range(len(store)))
+    report(chunks=len(store), text_chars=total)
+
+MODES = {
+    "synthetic_documents": synthetic_documents,
+    "synthetic_build": synthetic_build,
+    "synthetic_chunk_store": synthetic_chunk_store,
+    "real_legacy": real_legacy,
+    "real_build": real_build,
+    "real_current": real_current
+}
+
+def run_mode(mode: str, source: str, path: str) -> Dict[str, int]:
+    output = subprocess.run(
+        [sys.executable, "-m", "tools.measure_rss", "--mode", mode, "--source", source, "--path", path],
+        capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()
+    return json.loads(output[-1]) if output else {}
+
+def link_copies(pdf_dir: str, copies: int, target: str) -> None:
+    """Simulate a larger corpus by linking each PDF ``copies`` times."""
+    pdfs: List[str] = [name for name in sorted(os.listdir(pdf_dir)) if name.lower().endswith(".pdf")]
+    for copy in range(copies):
+        for name in pdfs:
+            os.symlink(os.path.abspath(os.path.join(pdf_dir, name)), os.path.join(target, f"copy{copy:03d}_{name}"))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--pdf-dir")
+    parser.add_argument("--copies", type=int, default=1)
+    parser.add_argument("--embedding", choices=["minilm", "fake"], default="minilm")
+    parser.add_argument("--mode", choices=list(MODES))
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        source = int(args.source) if args.mode.startswith("synthetic") else args.source
+        return MODES[args.mode](source, args.path)
+
+    # Passed through the environment so the measured subprocesses pick it up
+    os.environ["MEASURE_RSS_EMBEDDING"] = args.embedding
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.pdf_dir:
+            corpus = os.path.join(tmp, "pdfs")
+            os.makedirs(corpus)
+            link_copies(args.pdf_dir, args.copies, corpus)
+            store_dir = os.path.join(tmp, "store")
+            print(f"cold build (peak VmHWM): {run_mode('real_build', corpus, store_dir)}")
+            before = run_mode("real_legacy", corpus, "")
+            after = run_mode("real_current", corpus, store_dir)
+        else:
+            store_dir = os.path.join(tmp, "store")
+            run_mode("synthetic_build", str(args.chunks), store_dir)
+            before = run_mode("synthetic_documents", str(args.chunks), "")
+            after = run_mode("synthetic_chunk_store", str(args.chunks), store_dir)
+    print(f"before (Document lists): {before}")
+    print(f"after (ChunkStore):      {after}")
+    print(
+        f"RssAnon {before['RssAnon'] / 1024:.1f} MB -> {after['RssAnon'] / 1024:.1f} MB, "
+        f"VmRSS {before['VmRSS'] / 1024:.1f} MB -> {after['VmRSS'] / 1024:.1f} MB "
+        "(RssFile pages of the mapped store are shared between workers)"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 
 import streamlit as st
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Optional
 import time
 from utils.session import update_chat_title
 from utils.helpers import format_chat_history
@@ -11,6 +11,31 @@ def display_chat(messages: List[Dict[str, str]]) -> None:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
+def generate_response(
+    chains: Dict[str, Any],
+    prompt: str,
+    messages: List[Dict[str, str]],
+    is_alarm_related: Callable,
+    callbacks: Optional[List[Any]] = None
+) -> Dict[str, Any]:
+    """Run a user prompt through the matching RAG chain and return answer and contexts."""
+    # Format chat history
+    chat_history = format_chat_history(messages)
+    
+    # Choose appropriate chain based on question type
+    chain_type = 'alarm' if is_alarm_related(prompt) else 'general'
+    
+    response = chains[chain_type].invoke(
+        {"input": prompt, "chat_history": chat_history},
+        config={"callbacks": callbacks} if callbacks else None
+    )
+    
+    return {
+        "chain_type": chain_type,
+        "answer": response['answer'],
+        "contexts": [doc.page_content for doc in response['context']]
+    }
+
 def handle_user_input(chains: Dict[str, Any], is_alarm_related: Callable, evaluator: Any = None) -> None:
     """Handle user input and generate response."""
     if prompt := st.chat_input("What would you like to know about NOC operations?"):
@@ -29,19 +54,10 @@ def handle_user_input(chains: Dict[str, Any], is_alarm_related: Callable, evalua
                 # Update chat title if this is the first user message
                 update_chat_title(current_chat_id, messages)
                 
-                # Format chat history
-                chat_history = format_chat_history(messages)
-                
-                # Choose appropriate chain based on question type
-                chain_type = 'alarm' if is_alarm_related(prompt) else 'general'
-                
-                response = chains[chain_type].invoke({
-                    "input": prompt,
-                    "chat_history": chat_history
-                })
+                response = generate_response(chains, prompt, messages, is_alarm_related)
                 
                 # Store the retrieved documents for evaluation
-                retrieved_contexts = [doc.page_content for doc in response['context']]
+                retrieved_contexts = response['contexts']
                 
                 # Display assistant response
                 with st.chat_message("assistant"):
@@ -6,10 +6,50 @@ from typing import Dict, List, Any
 import numpy as np
 from datetime import datetime
 
-def render_evaluation_dashboard() -> None:
+def render_evaluation_queue(eval_queue: Any) -> None:
+    """Render background evaluation queue metrics and this session's jobs."""
+    st.subheader("Evaluation Queue")
+    stats = eval_queue.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Queued", stats["queued"])
+    with col2:
+        st.metric("Running", stats["running"])
+    with col3:
+        st.metric("Avg. Wait", f"{stats['avg_wait']:.1f}s")
+    with col4:
+        st.metric("Avg. / P95 Latency", f"{stats['avg_latency']:.1f}s / {stats['p95_latency']:.1f}s")
+    
+    jobs = eval_queue.get_jobs(st.session_state.evaluation_jobs)
+    if not jobs:
+        return
+    
+    jobs_df = pd.DataFrame([{
+        "job": job["id"],
+        "status": job["status"],
+        "question": job["question"],
+        "submitted": datetime.fromtimestamp(job["submitted_at"]).strftime('%Y-%m-%d %H:%M:%S'),
+        "latency (s)": round(job["finished_at"] - job["submitted_at"], 1) if job["finished_at"] else None,
+        "average_score": job["results"]["average_score"] if job["results"] else None,
+        "error": job["error"]
+    } for job in jobs])
+    st.dataframe(jobs_df)
+    
+    finished = {job["id"]: job for job in jobs if job["status"] == "done"}
+    if finished:
+        selected = st.selectbox(
+            "View evaluation details",
+            options=list(finished.keys()),
+            format_func=lambda job_id: f"{job_id} — {finished[job_id]['question'][:50]}"
+        )
+        display_evaluation_results(finished[selected]["results"])
+
+def render_evaluation_dashboard(eval_queue: Any) -> None:
     """Render the evaluation dashboard with visualization of results."""
     st.title("RAG System Evaluation Dashboard")
     
+    render_evaluation_queue(eval_queue)
+    
     if not st.session_state.evaluation_results:
         st.warning("No evaluation results available. Run some evaluations first!")
         return
@@ -76,8 +116,6 @@ def render_evaluation_dashboard() -> None:
 
 def display_evaluation_results(eval_results: Dict[str, Any]) -> None:
     """Display evaluation results in the UI."""
-    st.success("✅ Evaluation completed!")
-    
     # Display metrics with columns
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -108,11 +146,3 @@ def display_evaluation_results(eval_results: Dict[str, Any]) -> None:
         with col2:
             st.subheader("Ground Truth")
             st.write(eval_results['ground_truth'])
-    
-    # Continue button
-    if st.button("Continue Chatting", key="continue_after_eval"):
-        st.session_state.evaluation_complete = False
-        st.session_state.awaiting_evaluation = False
-        st.session_state.current_evaluation_data = None
-        st.session_state.evaluation_results_data = None
-        st.rerun()
\ No newline at end of file
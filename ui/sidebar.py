@@ -2,8 +2,46 @@
 import streamlit as st
 from typing import Dict, List, Any
 from utils.session import create_new_chat, reset_evaluation_state
+from models.namespaces import AUTO, ALL, VENDOR_KEYWORDS, TECHNOLOGY_KEYWORDS
+from models.answer_cache import get_answer_cache
 
-def render_sidebar() -> str:
+JOB_STATUS_ICONS = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌"}
+
+PENDING_STATUSES = ("queued", "running")
+
+def render_evaluation_jobs(eval_queue: Any) -> None:
+    """Show background evaluation status, polling only while this session has jobs in flight."""
+    jobs = eval_queue.get_jobs(st.session_state.evaluation_jobs)
+    if any(job["status"] in PENDING_STATUSES for job in jobs):
+        _render_evaluation_jobs_live(eval_queue)
+    else:
+        _render_job_list(eval_queue, jobs)
+
+@st.fragment(run_every=2)
+def _render_evaluation_jobs_live(eval_queue: Any) -> None:
+    jobs = eval_queue.get_jobs(st.session_state.evaluation_jobs)
+    _render_job_list(eval_queue, jobs)
+    # Rerun the whole app once nothing is pending, so the static view replaces this fragment,
+    # or when a job was requeued, so it is resumed with this session's evaluator
+    if not any(job["status"] in PENDING_STATUSES for job in jobs) or eval_queue.needs_resume(st.session_state.evaluation_jobs):
+        st.rerun()
+
+def _render_job_list(eval_queue: Any, jobs: List[Dict[str, Any]]) -> None:
+    stats = eval_queue.stats()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Queue Depth", stats["queued"] + stats["running"])
+    with col2:
+        st.metric("Avg. Job Latency", f"{stats['avg_latency']:.1f}s")
+    
+    for job in jobs[:5]:
+        question = job["question"][:30] + "..." if len(job["question"]) > 30 else job["question"]
+        if job["status"] == "done":
+            st.caption(f"{JOB_STATUS_ICONS['done']} {question} — score {job['results']['average_score']:.2f}")
+        else:
+            st.caption(f"{JOB_STATUS_ICONS[job['status']]} {question} — {job['status']}")
+
+def render_sidebar(eval_queue: Any) -> str:
     """Render the sidebar with configuration and chat history."""
     with st.sidebar:
         st.header("Config")
@@ -20,6 +58,44 @@ def render_sidebar() -> str:
             st.session_state.selected_language = selected_language
             st.rerun()
 
+        # Document scope: search only the matching vendor/technology shards
+        vendor_options = [AUTO, ALL] + list(VENDOR_KEYWORDS.keys())
+        technology_options = [AUTO, ALL] + list(TECHNOLOGY_KEYWORDS.keys())
+        st.session_state.selected_vendor = st.selectbox(
+            "Vendor",
+            options=vendor_options,
+            index=vendor_options.index(st.session_state.selected_vendor),
+            help="Auto infers the vendor from each question; All searches every vendor's documents"
+        )
+        st.session_state.selected_technology = st.selectbox(
+            "Technology",
+            options=technology_options,
+            index=technology_options.index(st.session_state.selected_technology),
+            help="Auto infers the technology from each question; All searches every technology"
+        )
+
+        # Cross-language answer reuse toggle
+        st.session_state.canonical_answers = st.toggle(
+            "Cross-language Answer Reuse",
+            value=st.session_state.canonical_answers,
+            help="Generate each answer once in English and serve other languages through cached translations"
+        )
+        if st.session_state.canonical_answers:
+            cache_stats = get_answer_cache().stats()
+            if cache_stats["requests"]:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Cache Hit Rate", f"{cache_stats['canonical_hit_rate']:.0%}")
+                    st.metric("Tokens Saved", f"{cache_stats['tokens_saved']:,.0f}")
+                with col2:
+                    st.metric(
+                        "Avg. Latency",
+                        f"{cache_stats['avg_latency']:.1f}s",
+                        delta=f"{cache_stats['avg_latency'] - cache_stats['avg_latency_baseline']:.1f}s",
+                        delta_color="inverse"
+                    )
+                    st.metric("LLM Calls", cache_stats["llm_calls"])
+
         # Evaluation mode toggle
         eval_mode = st.toggle("Evaluation Mode", value=st.session_state.evaluation_mode)
         if eval_mode != st.session_state.evaluation_mode:
@@ -31,6 +107,11 @@ def render_sidebar() -> str:
         if st.session_state.evaluation_mode:
             st.info("In evaluation mode, you'll be asked to provide ground truth answers for evaluation")
         
+        st.header("Bulk Triage")
+        if st.button("Bulk Alarm Triage", key="view_triage_button"):
+            st.session_state.view_triage = True
+            st.rerun()
+        
         st.header("Chat History")
         
         # New Chat button
@@ -59,7 +140,11 @@ def render_sidebar() -> str:
                 reset_evaluation_state()
                 st.rerun()
         
-        if len(st.session_state.evaluation_results) > 0:
+        if st.session_state.evaluation_jobs:
+            st.header("Evaluation Jobs")
+            render_evaluation_jobs(eval_queue)
+        
+        if len(st.session_state.evaluation_results) > 0 or st.session_state.evaluation_jobs:
             st.header("Evaluation Dashboard")
             if st.button("View Evaluation Results", key="view_eval"):
                 st.session_state.view_evaluation = True
@@ -0,0 +1,66 @@
+import io
+import streamlit as st
+import pandas as pd
+from typing import Any
+from datetime import datetime
+from models.rag import create_answer_chains
+from models.clustering import clustering_summary
+from models.triage import load_alarm_export, cluster_records, triage_alarms, TriageWriter, RESULT_FIELDS
+
+def render_triage_page(llm: Any, retriever: Any, language: str) -> None:
+    """Render the bulk alarm triage page for OSS alarm exports."""
+    st.title("Bulk Alarm Triage 🚨")
+    st.info("Upload an OSS alarm export (CSV or JSON) to triage every alarm in one run.", icon="ℹ️")
+    
+    uploaded = st.file_uploader("Alarm export", type=["csv", "json"])
+    max_concurrency = st.slider("Parallel LLM requests", min_value=1, max_value=16, value=4)
+    output_format = st.radio("Result format", options=["csv", "jsonl"], horizontal=True)
+    cluster = st.toggle("Answer duplicate alarms once", value=True, help="Groups alarms that differ only in site, cell or timestamp")
+    
+    if uploaded and st.button("Run Triage"):
+        records = load_alarm_export(uploaded.getvalue(), uploaded.name)
+        if not records:
+            st.warning("No alarms found in the uploaded file.")
+            return
+        
+        clusters = cluster_records(records, retriever) if cluster else None
+        if clusters is not None:
+            summary = clustering_summary(clusters)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Alarms", summary["alarms"])
+            with col2:
+                st.metric("Clusters", summary["clusters"], help=f"Largest cluster: {summary['largest_cluster']} alarms")
+            with col3:
+                st.metric("LLM Calls Saved", summary["llm_calls_saved"])
+        
+        answer_chain = create_answer_chains(llm, language)['alarm']
+        buffer = io.StringIO()
+        writer = TriageWriter(buffer, output_format)
+        results = []
+        progress = st.progress(0.0, text=f"Triaging {len(records)} alarms...")
+        table = st.empty()
+        
+        # Show each alarm as soon as its answer arrives
+        for result in triage_alarms(records, retriever, answer_chain, max_concurrency, clusters):
+            writer.write(result)
+            results.append(result)
+            progress.progress(len(results) / len(records), text=f"Triaged {len(results)}/{len(records)} alarms")
+            table.dataframe(pd.DataFrame(results, columns=RESULT_FIELDS).sort_values("row"))
+        
+        st.session_state.triage_output = {
+            "data": buffer.getvalue(),
+            "format": output_format,
+            "errors": sum(1 for result in results if result["error"]),
+            "count": len(results)
+        }
+    
+    output = st.session_state.get("triage_output")
+    if output:
+        st.success(f"✅ Triaged {output['count']} alarms ({output['errors']} errors)")
+        st.download_button(
+            label="Download Triage Results",
+            data=output["data"],
+            file_name=f"alarm_triage_{datetime.now().strftime('%Y%m%d_%H%M')}.{output['format']}",
+            mime="text/csv" if output["format"] == "csv" else "application/jsonl"
+        )
@@ -2,7 +2,8 @@
 import streamlit as st
 import uuid
 from typing import Dict, Any, List
-from config.settings import get_timestamp
+from config.settings import get_timestamp, load_configuration
+from models.namespaces import AUTO
 
 def generate_chat_id() -> str:
     """Generate a unique chat ID."""
@@ -32,6 +33,12 @@ def initialize_session_state(language: str, supported_languages: Dict[str, Dict[
     if "selected_language" not in st.session_state:
         st.session_state.selected_language = language
 
+    if "selected_vendor" not in st.session_state:
+        st.session_state.selected_vendor = AUTO
+
+    if "selected_technology" not in st.session_state:
+        st.session_state.selected_technology = AUTO
+
     if "evaluation_results" not in st.session_state:
         st.session_state.evaluation_results = []
 
@@ -44,15 +51,21 @@ def initialize_session_state(language: str, supported_languages: Dict[str, Dict[
     if "current_evaluation_data" not in st.session_state:
         st.session_state.current_evaluation_data = None
 
-    if "evaluation_complete" not in st.session_state:
-        st.session_state.evaluation_complete = False
+    if "evaluation_jobs" not in st.session_state:
+        st.session_state.evaluation_jobs = []
 
-    if "evaluation_results_data" not in st.session_state:
-        st.session_state.evaluation_results_data = None
+    if "merged_evaluation_jobs" not in st.session_state:
+        st.session_state.merged_evaluation_jobs = set()
 
     if "view_evaluation" not in st.session_state:
         st.session_state.view_evaluation = False
 
+    if "view_triage" not in st.session_state:
+        st.session_state.view_triage = False
+
+    if "canonical_answers" not in st.session_state:
+        st.session_state.canonical_answers = load_configuration()['canonical_answers']
+
 def update_chat_title(chat_id: str, messages: List[Dict[str, str]]) -> None:
     """Update chat title based on the first user message."""
     for msg in messages:
@@ -78,5 +91,13 @@ def reset_evaluation_state() -> None:
     """Reset evaluation-related state variables."""
     st.session_state.awaiting_evaluation = False
     st.session_state.current_evaluation_data = None
-    st.session_state.evaluation_complete = False
-    st.session_state.evaluation_results_data = None
\ No newline at end of file
+
+def sync_evaluation_results(jobs: List[Dict[str, Any]]) -> int:
+    """Copy results of finished evaluation jobs into the session; return how many were new."""
+    new_results = 0
+    for job in reversed(jobs):  # jobs come newest first
+        if job["status"] == "done" and job["id"] not in st.session_state.merged_evaluation_jobs:
+            st.session_state.evaluation_results.append(job["results"])
+            st.session_state.merged_evaluation_jobs.add(job["id"])
+            new_results += 1
+    return new_results